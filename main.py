@@ -460,7 +460,7 @@ class GUIMusicPlayer:
         elif self.library_view == 'stats':
             stats = self.music_manager.get_library_statistics()
             text = f"Total Songs: {stats['total_songs']}\nTotal Size: {stats['total_size_gb']:.2f} GB\nUnique Artists: {stats['unique_artists']}\n\nTop Artists:\n"
-            for artist, count in list(stats['artist_counts'].items())[:10]:
+            for artist, count in stats['artist_counts_top']:
                 text += f"{artist}: {count}\n"
             text += "\nFile Types:\n"
             for ft, count in stats['file_type_counts'].items():
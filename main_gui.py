@@ -7,7 +7,13 @@ Integrates all music player features into a graphical interface.
 import os
 import sys
 import json
+import functools
+import queue
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pygame
+import pygame.freetype
 from pygame.locals import *
 
 # Add src directory to path if needed
@@ -21,7 +27,17 @@ from src.stacks_queues_music import MusicPlayerStacksQueues
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 800
 FPS = 60
+PLAYLISTS_FILE = 'playlists.json'
+SAVE_DELAY = 0.5  # Seconds of inactivity before pending playlist edits are written
 MUSIC_END = USEREVENT + 1
+REFRESH_EVENT = USEREVENT + 2
+REFRESH_INTERVAL = 500  # Milliseconds between refreshes of live views (Status tab)
+SEARCH_DELAY_FRAMES = 6  # Frames of typing inactivity before a live search runs
+SCAN_REFRESH_FRAMES = 15  # Frames between library list updates while a scan is running
+IDLE_WAIT = 100  # Milliseconds to block for input when nothing on screen is changing
+# Above these limits a full flip is cheaper than a partial display update
+MAX_DIRTY_RECTS = 30
+MAX_DIRTY_AREA = SCREEN_WIDTH * SCREEN_HEIGHT // 2
 
 # Colors
 BLACK = (0, 0, 0)
@@ -34,36 +50,120 @@ GREEN = (50, 200, 100)
 RED = (200, 50, 50)
 YELLOW = (255, 200, 50)
 
+# Fonts are shared by size so rendered text can be cached per (size, text, color)
+_fonts = {}
+
+def _get_font(size):
+    font = _fonts.get(size)
+    if font is None:
+        # pygame.font shrinks its default font to 0.6875 of the requested size; match it
+        font = _fonts[size] = pygame.freetype.Font(None, int(size * 0.6875))
+        font.pad = True  # Full line height, like pygame.font, so rows share a baseline
+    return font
+
+@functools.lru_cache(maxsize=4096)
+def _render_text(font_size, text, color):
+    surf, _ = _get_font(font_size).render(text, color)
+    # Convert once to the display format so later blits skip per-pixel conversion
+    return surf.convert_alpha() if pygame.display.get_surface() else surf
+
+@functools.lru_cache(maxsize=32)
+def _glyph_atlas(font_size, color):
+    # Printable ASCII rendered once per font/colour; lines are then assembled from these
+    return {code: _render_text(font_size, chr(code), color) for code in range(32, 127)}
+
+def render_line_fast(screen, text, pos, glyph_map, font_size, color=WHITE, pairs=None):
+    # Lay out one line glyph by glyph; pass a shared pairs list to batch several lines
+    x, y = pos
+    own_pairs = pairs is None
+    if own_pairs:
+        pairs = []
+    for ch in text:
+        glyph = glyph_map.get(ord(ch))
+        if glyph is None:
+            # Emoji and other non-ASCII characters fall back to the text cache
+            glyph = _render_text(font_size, ch, color)
+        pairs.append((glyph, (x, y)))
+        x += glyph.get_width()
+    if own_pairs:
+        screen.blits(pairs, doreturn=False)
+    return x - pos[0]
+
+@functools.lru_cache(maxsize=256)
+def _panel_surface(size, color, border_color, border_width, border_radius):
+    # Rounded, outlined panel rendered once per size/colour instead of every frame
+    surf = pygame.Surface(size, SRCALPHA)
+    rect = surf.get_rect()
+    pygame.draw.rect(surf, color, rect, border_radius=border_radius)
+    pygame.draw.rect(surf, border_color, rect, width=border_width, border_radius=border_radius)
+    return surf.convert_alpha() if pygame.display.get_surface() else surf
+
+def _probe_duration(file_path):
+    # Song length in milliseconds, or 0 if the file can't be decoded
+    try:
+        return pygame.mixer.Sound(file_path).get_length() * 1000
+    except:
+        return 0
+
+def _hit(rects, pos):
+    # Index of the first rect containing pos, or -1; the scan runs in one C call
+    return pygame.Rect(pos, (1, 1)).collidelist(rects)
+
+def draw_buttons(screen, buttons):
+    # Draw every button body first, then hand all labels to one blits() call
+    labels = []
+    for btn in buttons:
+        btn.draw_background(screen)
+        labels.append(btn.label_blit())
+    screen.blits(labels, doreturn=False)
+    return [btn.rect for btn in buttons]
+
 class Button:
     def __init__(self, x, y, width, height, text, color=BLUE, text_color=WHITE, font_size=24):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
         self.color = color
         self.text_color = text_color
-        self.font = pygame.font.Font(None, font_size)
+        self.font_size = font_size
+        self.font = _get_font(font_size)
+        self._text_surf = _render_text(font_size, text, text_color)
+        self._rendered_text = text
         self.hover_color = (min(color[0]+50,255), min(color[1]+50,255), min(color[2]+50,255))
         self.hovered = False
     
     def draw(self, screen):
+        self.draw_background(screen)
+        screen.blit(*self.label_blit())
+        return self.rect
+    
+    def draw_background(self, screen):
         color = self.hover_color if self.hovered else self.color
-        pygame.draw.rect(screen, color, self.rect, border_radius=8)
-        pygame.draw.rect(screen, WHITE, self.rect, width=1, border_radius=8)
-        text_surf = self.font.render(self.text, True, self.text_color)
-        text_rect = text_surf.get_rect(center=self.rect.center)
-        screen.blit(text_surf, text_rect)
+        screen.blit(_panel_surface(self.rect.size, color, WHITE, 1, 8), self.rect)
     
-    def handle_event(self, event, pos):
+    def label_blit(self):
+        # Some buttons (Back, Play/Pause) relabel themselves at runtime
+        if self._rendered_text != self.text:
+            self._text_surf = _render_text(self.font_size, self.text, self.text_color)
+            self._rendered_text = self.text
+        return self._text_surf, self._text_surf.get_rect(center=self.rect.center)
+    
+    def update_hover(self, pos):
         self.hovered = self.rect.collidepoint(pos)
-        if event.type == MOUSEBUTTONDOWN and self.hovered:
-            return True
-        return False
+    
+    def hit(self, pos):
+        return self.rect.collidepoint(pos)
+    
+    def handle_event(self, event, pos):
+        # Hover is tracked by the player on mouse motion; only clicks are hit-tested here
+        return event.type == MOUSEBUTTONDOWN and self.hit(pos)
 
 class TextInput:
     def __init__(self, x, y, width, height, font_size=24):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = ""
         self.active = False
-        self.font = pygame.font.Font(None, font_size)
+        self.font_size = font_size
+        self.font = _get_font(font_size)
         self.color = LIGHT_GRAY
         self.active_color = WHITE
         self.text_color = BLACK
@@ -82,78 +182,143 @@ class TextInput:
     
     def draw(self, screen):
         color = self.active_color if self.active else self.color
-        pygame.draw.rect(screen, color, self.rect, border_radius=8)
-        pygame.draw.rect(screen, GRAY, self.rect, width=1, border_radius=8)
-        text_surf = self.font.render(self.text, True, self.text_color)
+        screen.blit(_panel_surface(self.rect.size, color, GRAY, 1, 8), self.rect)
+        text_surf = _render_text(self.font_size, self.text, self.text_color)
         screen.blit(text_surf, (self.rect.x + 10, self.rect.y + 5))
+        return self.rect
 
 class ScrollableList:
     def __init__(self, x, y, width, height, items=[], font_size=20):
         self.rect = pygame.Rect(x, y, width, height)
-        self.items = items  # List of strings or dicts
-        self.font = pygame.font.Font(None, font_size)
-        self.scroll_offset = 0
+        self.font_size = font_size
+        self.font = _get_font(font_size)
         self.item_height = 30
-        self.selected_index = -1
-        self.is_dict = False
+        self._bg = _panel_surface(self.rect.size, DARK_GRAY, GRAY, 2, 10)
+        self.set_items(items)  # List of strings or dicts
     
     def set_items(self, items):
         self.items = items
         self.scroll_offset = 0
         self.selected_index = -1
         self.is_dict = items and isinstance(items[0], dict)
+        # Row text is formatted once here rather than on every draw
+        if self.is_dict:
+            self._labels = [f"{item['title']} - {item['artist']}" for item in items]
+        else:
+            self._labels = [str(item) for item in items]
+        self._row_cache = {}  # index -> rendered row, filled as rows scroll into view
+        self._update_extent()
+    
+    def items_appended(self):
+        # The items list grew in place; label only the new rows and keep scroll and selection
+        if not self._labels:
+            self.set_items(self.items)
+            return
+        new_items = self.items[len(self._labels):]
+        if self.is_dict:
+            self._labels.extend(f"{item['title']} - {item['artist']}" for item in new_items)
+        else:
+            self._labels.extend(str(item) for item in new_items)
+        self._update_extent()
+    
+    def _update_extent(self):
+        # Scroll limits and scrollbar size only change with the item count; rows are the
+        # labelled items, since a list shared with a running scan can grow ahead of its labels
+        self._total_height = len(self._labels) * self.item_height
+        self._max_scroll = max(0, self._total_height - self.rect.height + 10)
+        if self._total_height > self.rect.height:
+            self._bar_height = max(20, self.rect.height * (self.rect.height / self._total_height))
+        else:
+            self._bar_height = 0
     
     def draw(self, screen):
-        pygame.draw.rect(screen, DARK_GRAY, self.rect, border_radius=10)
-        pygame.draw.rect(screen, GRAY, self.rect, width=2, border_radius=10)
+        screen.blit(self._bg, self.rect)
         screen.set_clip(self.rect)
         
-        for i, item in enumerate(self.items):
+        # Only the rows inside the viewport are visited
+        first, last = self.visible_range()
+        blit_list = []
+        labels = self._labels
+        row_cache = self._row_cache
+        for i in range(first, last):
             y_pos = self.rect.y + 5 + (i * self.item_height) - self.scroll_offset
-            if y_pos + self.item_height < self.rect.y or y_pos > self.rect.bottom:
-                continue
-            
-            color = YELLOW if i == self.selected_index else WHITE
-            if self.is_dict:
-                text = f"{item['title']} - {item['artist']}"
+            if i == self.selected_index:
+                surf = _render_text(self.font_size, labels[i], YELLOW)
             else:
-                text = str(item)
-            text_surf = self.font.render(text, True, color)
-            screen.blit(text_surf, (self.rect.x + 15, y_pos))
+                surf = row_cache.get(i)
+                if surf is None:
+                    surf = row_cache[i] = _render_text(self.font_size, labels[i], WHITE)
+            blit_list.append((surf, (self.rect.x + 15, y_pos)))
+        screen.blits(blit_list, doreturn=False)
         
         screen.set_clip(None)
-        
-        # Scrollbar
-        total_height = len(self.items) * self.item_height
-        if total_height > self.rect.height:
-            bar_height = max(20, self.rect.height * (self.rect.height / total_height))
-            bar_y = self.rect.y + (self.scroll_offset / total_height) * self.rect.height
-            pygame.draw.rect(screen, LIGHT_GRAY, (self.rect.right - 10, bar_y, 8, bar_height), border_radius=4)
+        self.draw_scrollbar(screen)
+        return self.rect
+    
+    def visible_range(self):
+        first = max(0, (self.scroll_offset - 5) // self.item_height)
+        last = min(len(self._labels), (self.scroll_offset + self.rect.height - 5) // self.item_height + 1)
+        return first, last
+    
+    def draw_scrollbar(self, screen):
+        if self._bar_height:
+            bar_y = self.rect.y + (self.scroll_offset / self._total_height) * self.rect.height
+            pygame.draw.rect(screen, LIGHT_GRAY, (self.rect.right - 10, bar_y, 8, self._bar_height), border_radius=4)
     
     def handle_click(self, pos):
         if self.rect.collidepoint(pos):
             rel_y = pos[1] - self.rect.y + self.scroll_offset - 5
             index = rel_y // self.item_height
-            if 0 <= index < len(self.items):
+            if 0 <= index < len(self._labels):
                 self.selected_index = index
                 return self.items[index]
         return None
     
+    def select(self, index):
+        # Highlight a row without rebuilding the items, scrolling it into view
+        self.selected_index = index
+        if index >= 0:
+            top = index * self.item_height
+            if top < self.scroll_offset:
+                self.scroll_offset = top
+            elif top + self.item_height > self.scroll_offset + self.rect.height - 10:
+                self.scroll_offset = min(self._max_scroll, top + self.item_height - self.rect.height + 10)
+    
     def handle_scroll(self, direction):
         step = self.item_height * 3 if abs(direction) > 1 else self.item_height
-        self.scroll_offset += -step * direction
-        self.scroll_offset = max(0, min(self.scroll_offset, len(self.items) * self.item_height - self.rect.height + 10))
+        offset = self.scroll_offset - step * direction
+        self.scroll_offset = 0 if offset < 0 else self._max_scroll if offset > self._max_scroll else offset
 
 class TextDisplay:
     def __init__(self, x, y, width, height, font_size=20):
         self.list = ScrollableList(x, y, width, height, font_size=font_size)
+        self.text = None
+        self.glyph_map = _glyph_atlas(font_size, WHITE)
     
     def set_text(self, text):
+        # Periodic refreshes usually produce the same text; keep the scroll position then
+        if text == self.text:
+            return False
+        self.text = text
         lines = text.split('\n')
         self.list.set_items(lines)
+        return True
     
     def draw(self, screen):
-        self.list.draw(screen)
+        # Status text changes on every refresh, so build lines from glyphs instead of
+        # rasterizing (and caching) each new line
+        lst = self.list
+        screen.blit(lst._bg, lst.rect)
+        screen.set_clip(lst.rect)
+        first, last = lst.visible_range()
+        pairs = []
+        for i in range(first, last):
+            y_pos = lst.rect.y + 5 + (i * lst.item_height) - lst.scroll_offset
+            render_line_fast(screen, lst._labels[i], (lst.rect.x + 15, y_pos), self.glyph_map, lst.font_size, WHITE, pairs)
+        screen.blits(pairs, doreturn=False)
+        screen.set_clip(None)
+        lst.draw_scrollbar(screen)
+        return lst.rect
     
     def handle_scroll(self, direction):
         self.list.handle_scroll(direction)
@@ -163,12 +328,24 @@ class GUIMusicPlayer:
         pygame.init()
         pygame.mixer.init()
         pygame.mixer.music.set_endevent(MUSIC_END)
+        pygame.time.set_timer(REFRESH_EVENT, REFRESH_INTERVAL)
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Go Streamer")
         self.clock = pygame.time.Clock()
-        self.title_font = pygame.font.Font(None, 48)
-        self.font = pygame.font.Font(None, 32)
-        self.small_font = pygame.font.Font(None, 24)
+        self.title_font = _get_font(48)
+        self.font = _get_font(32)
+        self.small_font = _get_font(24)
+        # Fixed labels are rendered once; draw() only blits them
+        self._title_surf = _render_text(48, "🎵 Music Streamer", BLUE)
+        self._next_label = _render_text(32, "Play Next Queue", WHITE)
+        self._party_label = _render_text(32, "Party Queue", WHITE)
+        self._vol_label = _render_text(24, "Volume", WHITE)
+        self._time_surf = None
+        # Half-transparent black laid over the screen behind modals
+        self._modal_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), SRCALPHA)
+        self._modal_overlay.fill((*BLACK, 128))
+        self._modal_overlay = self._modal_overlay.convert_alpha()
+        self._time_key = None
         
         # Initialize components
         self.music_dir = r"D:\projects\Music_Stream\music"
@@ -179,12 +356,32 @@ class GUIMusicPlayer:
         self.modal = None
         self.message = ""
         self.message_timer = 0
+        # The message area is only pushed to the display when it appears, changes or expires
+        self._message_surf = None
+        self._message_dirty = False
+        self._message_rect = None
         self.library_view = 'all'
         self.selected_artist = None
         self.selected_file_type = None
         self.current_duration = 0
         self.progress_rect = pygame.Rect(SCREEN_WIDTH//2 - 300, SCREEN_HEIGHT - 150, 600, 20)
+        # Screen regions drawn this frame and last frame; both are pushed to the display
+        self.dirty_rects = []
+        self._last_dirty_rects = []
+        self.hovered_button = None
+        # List refreshes are coalesced by name and run just before the frame they're due in
+        self._frame_id = 0
+        self._pending_refresh = {}
+        # The screen is only redrawn when something visible has changed
+        self.needs_redraw = True
+        self._progress_second = -1
+        self._mixer_pos = 0  # Playback position polled once per frame in update()
         self.playlist_descriptions = {}  # Store playlist descriptions
+        # Playlist saves run on a background timer; the lock serializes file writes
+        self._save_lock = threading.Lock()
+        self._save_timer = None
+        self._pending_save = None
+        self._json_fragments = {}  # name -> (songs, description, serialized entry)
         
         if not self.initialize_music_library():
             print("Failed to initialize. Exiting.")
@@ -192,6 +389,7 @@ class GUIMusicPlayer:
         
         # Tabs
         self.tabs = ["Library", "Playlists", "Queues", "History", "Status", "Now Playing"]
+        self._tab_keys = [tab.lower().replace(" ", "_") for tab in self.tabs]  # Values of current_tab
         self.current_tab = "library"
         self.tab_buttons = []
         for i, tab in enumerate(self.tabs):
@@ -230,6 +428,14 @@ class GUIMusicPlayer:
             Button(920, 710, 140, 40, "Next Song"),
             Button(1070, 710, 140, 40, "Prev Song")
         ]
+        # Click handlers, index-aligned with playlist_buttons
+        self._playlist_handlers = [
+            self._pl_list_all, self._pl_create_new, self._pl_create_from_library, self._pl_switch,
+            self._pl_delete, self._pl_add_song, self._pl_insert_after, self._pl_remove_song,
+            self._pl_search_song, self._pl_shuffle, self._pl_play, self._pl_list_all,
+            self._pl_first_song, self._pl_last_song, self._pl_next_song, self._pl_prev_song
+        ]
+        self._playlist_rects = [btn.rect for btn in self.playlist_buttons]
         self.refresh_playlists()
         
         # Queues tab
@@ -246,6 +452,12 @@ class GUIMusicPlayer:
             Button(20, 760, 140, 40, "View History"),
             Button(170, 760, 140, 40, "Search History")
         ]
+        self._queue_handlers = [
+            self._q_add_to_next, self._q_play_next, self._q_clear_next, self._q_add_to_party,
+            self._q_upvote, self._q_play_party, self._q_clear_party, self._q_view_history,
+            self._q_search_history
+        ]
+        self._queue_rects = [btn.rect for btn in self.queues_buttons]
         self.refresh_queues()
         
         # History tab
@@ -266,6 +478,8 @@ class GUIMusicPlayer:
             Button(SCREEN_WIDTH//2, SCREEN_HEIGHT - 100, 140, 40, "Next"),
             Button(SCREEN_WIDTH//2 + 150, SCREEN_HEIGHT - 100, 140, 40, "Prev")
         ]
+        self._now_playing_handlers = [self._np_play_pause, self._np_stop, self._np_next, self._np_prev]
+        self._now_playing_rects = [btn.rect for btn in self.now_play_btns]
         self.volume_slider = pygame.Rect(SCREEN_WIDTH - 200, SCREEN_HEIGHT - 80, 150, 20)
         self.volume = 1.0
         self.update_now_playing()
@@ -274,19 +488,18 @@ class GUIMusicPlayer:
     
     def initialize_music_library(self):
         try:
-            self.music_manager = MusicPlaylistManager(self.music_dir)
-            song_library = self.music_manager.get_song_library()
-            if not song_library:
+            self.music_manager = MusicPlaylistManager(self.music_dir, load=False)
+            if not self.music_manager.music_directory.exists():
+                print(f"Error: Music directory '{self.music_dir}' does not exist.")
                 return False
-            for song in song_library:
-                try:
-                    sound = pygame.mixer.Sound(song['file_path'])
-                    song['duration'] = sound.get_length() * 1000
-                except:
-                    song['duration'] = 0
             self.playlist_manager = PlaylistManager()
             self.stacks_queues_player = MusicPlayerStacksQueues(self.music_manager)
             self.load_playlists()
+            # The library fills in from a background scan; poll_library_scan() picks up each batch
+            self._duration_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+            self._probed = queue.SimpleQueue()  # (song, duration) pairs from finished probes
+            self._closing = False
+            self.music_manager.scan_async()
             return True
         except Exception as e:
             print(f"Error initializing music library: {e}")
@@ -294,40 +507,83 @@ class GUIMusicPlayer:
     
     def load_playlists(self):
         try:
-            if os.path.exists('playlists.json'):
-                with open('playlists.json', 'r') as f:
+            if os.path.exists(PLAYLISTS_FILE):
+                with open(PLAYLISTS_FILE, 'r') as f:
                     data = json.load(f)
+                known_paths = self.music_manager.cached_file_paths()
                 for name, playlist_data in data.items():
                     songs = playlist_data.get('songs', [])
                     desc = playlist_data.get('description', '')
                     self.playlist_manager.create_playlist(name)
                     self.playlist_descriptions[name] = desc
                     pl = self.playlist_manager.get_current_playlist()
-                    for song_data in songs:
-                        # Verify song exists in library
-                        if any(song['file_path'] == song_data['file_path'] for song in self.music_manager.get_song_library()):
-                            pl.add_song_at_end(song_data)
+                    # The library is still loading; files seen by the last scan are known to exist,
+                    # anything else is checked on disk. drop_songs_missing_from_library() settles it
+                    pl.bulk_add(song_data for song_data in songs
+                                if song_data['file_path'] in known_paths or os.path.exists(song_data['file_path']))
                     self.playlist_manager.switch_playlist(None)  # Reset current playlist
                 if data:
                     self.playlist_manager.switch_playlist(list(data.keys())[0])
         except Exception as e:
             print(f"Error loading playlists: {e}")
     
+    def _playlists_snapshot(self):
+        return [(name, self.playlist_descriptions.get(name, ''), pl.as_list())
+                for name, pl in self.playlist_manager.playlists.items()]
+    
+    def _playlist_fragment(self, name, desc, songs):
+        # as_list() hands out a new list after every structural change, so an unchanged
+        # list object means the playlist's JSON from the last save can be reused
+        cached = self._json_fragments.get(name)
+        if cached and cached[0] is songs and cached[1] == desc:
+            return cached[2]
+        entry = json.dumps({'description': desc, 'songs': songs}, indent=4)
+        # Nest one level deeper to match json.dumps(data, indent=4) of the whole file
+        fragment = json.dumps(name) + ": " + entry.replace('\n', '\n    ')
+        self._json_fragments[name] = (songs, desc, fragment)
+        return fragment
+    
+    def _write_playlists(self):
+        with self._save_lock:
+            # Always write the newest snapshot, even if it was taken while waiting for the lock
+            snapshot = self._pending_save
+            fragments = [self._playlist_fragment(name, desc, songs) for name, desc, songs in snapshot]
+            for name in self._json_fragments.keys() - {name for name, _, _ in snapshot}:
+                del self._json_fragments[name]
+            text = "{\n    " + ",\n    ".join(fragments) + "\n}" if fragments else "{}"
+            # Write to a uniquely named temp file beside the target and swap it in,
+            # so a crash or a second running player never leaves a truncated file
+            with tempfile.NamedTemporaryFile('w', dir=os.path.dirname(os.path.abspath(PLAYLISTS_FILE)),
+                                             prefix=os.path.basename(PLAYLISTS_FILE) + '.', suffix='.tmp', delete=False) as f:
+                f.write(text)
+            try:
+                os.replace(f.name, PLAYLISTS_FILE)
+            except OSError:
+                os.unlink(f.name)
+                raise
+    
     def save_playlists(self):
+        if self._save_timer:
+            self._save_timer.cancel()
+            self._save_timer = None
+        try:
+            self._pending_save = self._playlists_snapshot()
+            self._write_playlists()
+        except Exception as e:
+            print(f"Error saving playlists: {e}")
+    
+    def _schedule_save(self):
+        # Snapshot on the main thread, write from a timer thread once edits settle
+        self._pending_save = self._playlists_snapshot()
+        if self._save_timer:
+            self._save_timer.cancel()
+        self._save_timer = threading.Timer(SAVE_DELAY, self._do_save)
+        self._save_timer.daemon = True
+        self._save_timer.start()
+    
+    def _do_save(self):
         try:
-            data = {}
-            for name, pl in self.playlist_manager.playlists.items():
-                songs = []
-                curr = pl.head
-                while curr:
-                    songs.append(curr.song_data)
-                    curr = curr.next
-                data[name] = {
-                    'description': self.playlist_descriptions.get(name, ''),
-                    'songs': songs
-                }
-            with open('playlists.json', 'w') as f:
-                json.dump(data, f, indent=4)
+            self._write_playlists()
         except Exception as e:
             print(f"Error saving playlists: {e}")
     
@@ -387,8 +643,10 @@ class GUIMusicPlayer:
                     self.show_message("Please enter a valid number")
                     return True
                 desc = self.modal['desc_input'].text if 'desc_input' in self.modal and self.modal['desc_input'] else ""
-                self.modal['on_confirm'](self.modal['name_input'].text, desc)
-                self.modal = None
+                name = self.modal['name_input'].text
+                # Close first so the callback can open a follow-up modal
+                on_confirm, self.modal = self.modal['on_confirm'], None
+                on_confirm(name, desc)
                 return True
             if self.modal['cancel'].handle_event(event, pos):
                 self.modal = None
@@ -397,8 +655,8 @@ class GUIMusicPlayer:
             if event.type == MOUSEBUTTONDOWN:
                 selected = self.modal['list'].handle_click(pos)
                 if selected:
-                    self.modal['on_select'](selected)
-                    self.modal = None
+                    on_select, self.modal = self.modal['on_select'], None
+                    on_select(selected)
                     return True
             elif event.type == MOUSEWHEEL:
                 self.modal['list'].handle_scroll(event.y)
@@ -407,8 +665,8 @@ class GUIMusicPlayer:
                 return True
         elif modal_type == 'confirm':
             if self.modal['yes'].handle_event(event, pos):
-                self.modal['on_yes']()
-                self.modal = None
+                on_yes, self.modal = self.modal['on_yes'], None
+                on_yes()
                 return True
             if self.modal['no'].handle_event(event, pos):
                 self.modal = None
@@ -416,18 +674,16 @@ class GUIMusicPlayer:
         return True
     
     def draw_modal(self):
-        pygame.draw.rect(self.screen, GRAY, self.modal['rect'], border_radius=10)
-        pygame.draw.rect(self.screen, WHITE, self.modal['rect'], width=2, border_radius=10)
-        prompt_surf = self.small_font.render(self.modal['prompt'] if 'prompt' in self.modal else self.modal['title'], True, WHITE)
+        self.dirty_rects.append(self.modal['rect'])
+        self.screen.blit(_panel_surface(self.modal['rect'].size, GRAY, WHITE, 2, 10), self.modal['rect'])
+        prompt_surf = _render_text(24, self.modal['prompt'] if 'prompt' in self.modal else self.modal['title'], WHITE)
         self.screen.blit(prompt_surf, (self.modal['rect'].x + 20, self.modal['rect'].y + 20))
         if self.modal['type'] == 'text':
             self.modal['name_input'].draw(self.screen)
             if 'desc_input' in self.modal and self.modal['desc_input']:
-                desc_label = self.small_font.render("Description:", True, WHITE)
-                self.screen.blit(desc_label, (self.modal['rect'].x + 50, self.modal['desc_input'].rect.y - 25))
+                self.screen.blit(_render_text(24, "Description:", WHITE), (self.modal['rect'].x + 50, self.modal['desc_input'].rect.y - 25))
                 self.modal['desc_input'].draw(self.screen)
-            name_label = self.small_font.render("Name:", True, WHITE)
-            self.screen.blit(name_label, (self.modal['rect'].x + 50, self.modal['name_input'].rect.y - 25))
+            self.screen.blit(_render_text(24, "Name:", WHITE), (self.modal['rect'].x + 50, self.modal['name_input'].rect.y - 25))
             self.modal['confirm'].draw(self.screen)
             self.modal['cancel'].draw(self.screen)
         elif self.modal['type'] == 'song_select':
@@ -457,7 +713,7 @@ class GUIMusicPlayer:
         elif self.library_view == 'stats':
             stats = self.music_manager.get_library_statistics()
             text = f"Total Songs: {stats['total_songs']}\nTotal Size: {stats['total_size_gb']:.2f} GB\nUnique Artists: {stats['unique_artists']}\n\nTop Artists:\n"
-            for artist, count in list(stats['artist_counts'].items())[:10]:
+            for artist, count in stats['artist_counts_top']:
                 text += f"{artist}: {count}\n"
             text += "\nFile Types:\n"
             for ft, count in stats['file_type_counts'].items():
@@ -465,17 +721,41 @@ class GUIMusicPlayer:
             self.library_list.set_items(text.split('\n'))
         self.library_back_btn.text = "Back" if self.selected_artist or self.selected_file_type else ""
     
+    def refresh_scanned_library(self):
+        # Scan batches only extend the full song list; a search or another view is left alone
+        if self.library_view == 'all' and not self.library_search_input.text:
+            songs = self.music_manager.get_song_library()
+            if self.library_list.items is songs:
+                # The library grows in place, so only the new rows need labels
+                self.library_list.items_appended()
+            else:
+                self.library_list.set_items(songs)
+    
+    def search_library(self, query):
+        if query:
+            self.library_list.set_items(self.music_manager.search_songs(query))
+        else:
+            self.refresh_library()
+    
     def refresh_playlists(self):
+        self.refresh_playlist_names()
+        self.refresh_current_songs()
+        self.refresh_current_index()
+    
+    def refresh_playlist_names(self):
         pl_names = list(self.playlist_manager.playlists.keys())
         self.playlists_list.set_items(pl_names)
+    
+    def refresh_current_songs(self):
         current_pl = self.playlist_manager.get_current_playlist()
         if current_pl:
-            songs = []
-            curr = current_pl.head
-            while curr:
-                songs.append(curr.song_data)
-                curr = curr.next
-            self.playlist_songs_list.set_items(songs)
+            self.playlist_songs_list.set_items(current_pl.as_list())
+    
+    def refresh_current_index(self):
+        # Moving through a playlist only changes which row is highlighted
+        current_pl = self.playlist_manager.get_current_playlist()
+        if current_pl:
+            self.playlist_songs_list.select(current_pl.current_index())
     
     def refresh_queues(self):
         next_queue = [song for song in self.stacks_queues_player.play_next_queue.queue]
@@ -518,7 +798,7 @@ class GUIMusicPlayer:
             text += f"🎵 Currently Playing: {current['title']} - {current['artist']}\n"
         
         text += "=" * 80
-        self.status_display.set_text(text)
+        return self.status_display.set_text(text)
     
     def update_now_playing(self):
         if self.stacks_queues_player.currently_playing:
@@ -530,13 +810,170 @@ class GUIMusicPlayer:
             self.now_playing_label = "No song playing"
             self.current_duration = 0
     
+    def _schedule(self, name, fn, *args, delay_frames=0):
+        # A later request under the same name replaces the pending one
+        self._pending_refresh[name] = (self._frame_id + delay_frames, fn, args)
+    
+    def run_scheduled(self):
+        due = [name for name, (frame, _, _) in self._pending_refresh.items() if frame <= self._frame_id]
+        for name in due:
+            _, fn, args = self._pending_refresh.pop(name)
+            fn(*args)
+        return bool(due)
+    
+    def poll_library_scan(self):
+        songs = self.music_manager.drain_scan()
+        if songs:
+            # Decoding every file is slow, so probe each one on the pool, in parallel
+            for song in songs:
+                self._duration_pool.submit(self._probe_song, song)
+            # Batches arriving close together share one list update
+            if 'library_scan' not in self._pending_refresh:
+                self._schedule('library_scan', self.refresh_scanned_library, delay_frames=SCAN_REFRESH_FRAMES)
+            self.show_message(f"Loading music library... {len(self.music_manager.get_song_library())} songs")
+        if not self.music_manager.scanning:
+            self.drop_songs_missing_from_library()
+            total = len(self.music_manager.get_song_library())
+            self.show_message(f"📚 Loaded {total} songs" if total else "No songs found in the music directory")
+    
+    def drop_songs_missing_from_library(self):
+        # Playlists were loaded before the scan, against the last scan's cache; now that the
+        # library is complete, keep only songs that are in it
+        paths = {song['file_path'] for song in self.music_manager.get_song_library()}
+        removed = 0
+        for pl in self.playlist_manager.playlists.values():
+            removed += pl.retain_songs(lambda song: song['file_path'] in paths)
+        if removed:
+            self._schedule('playlists', self.refresh_playlists)
+    
+    def _probe_song(self, song):
+        # Runs on the pool; the result is applied on the main thread by apply_probed_durations()
+        if self._closing:
+            return
+        self._probed.put((song, _probe_duration(song['file_path'])))
+    
+    def apply_probed_durations(self):
+        probed = []
+        while True:
+            try:
+                probed.append(self._probed.get_nowait())
+            except queue.Empty:
+                break
+        # Playlists share song dicts with the library, so hold off a save that is mid-write,
+        # and drop the saved JSON of any playlist holding a song whose duration changed.
+        # The playing song may be a separate dict loaded from a playlist; it is updated too
+        playing = self.stacks_queues_player.currently_playing
+        updated = set()
+        with self._save_lock:
+            for song, duration in probed:
+                song['duration'] = duration
+                updated.add(id(song))
+                if playing and playing['file_path'] == song['file_path']:
+                    playing['duration'] = duration
+                    updated.add(id(playing))
+                    # The song started before its probe finished; show its progress bar now
+                    self.current_duration = duration
+                    self.needs_redraw = True
+            for name, (songs, _, _) in list(self._json_fragments.items()):
+                if any(id(song) in updated for song in songs):
+                    del self._json_fragments[name]
+    
+    def update(self):
+        # Per-frame bookkeeping that decides whether the next frame needs drawing
+        self._frame_id += 1
+        if self.music_manager.scanning:
+            self.poll_library_scan()
+        if not self._probed.empty():
+            self.apply_probed_durations()
+        if self.run_scheduled():
+            self.needs_redraw = True
+        if self.message_timer > 0:
+            self.message_timer -= 1
+            if self.message_timer == 0:
+                self.needs_redraw = True
+        if self.current_tab == "now_playing" and self.current_duration > 0:
+            self._mixer_pos = pygame.mixer.music.get_pos()
+            second = self._mixer_pos // 1000
+            if second != self._progress_second:
+                self._progress_second = second
+                self.needs_redraw = True
+    
     def show_message(self, msg, duration=180):
         self.message = msg
         self.message_timer = duration
+        # Rendered once here; draw() only blits it while the timer runs
+        self._message_surf = self.small_font.render(msg, YELLOW)[0].convert_alpha()
+        self._message_dirty = True
+        self.needs_redraw = True
+    
+    def current_buttons(self):
+        # Tab bar plus the active tab's buttons, as drawn each frame
+        buttons = list(self.tab_buttons)
+        if self.current_tab == "library":
+            buttons += [self.library_all_btn, self.library_artist_btn, self.library_type_btn, self.library_stats_btn]
+            if self.library_back_btn.text:
+                buttons.append(self.library_back_btn)
+            buttons.append(self.library_search_btn)
+        elif self.current_tab == "playlists":
+            buttons += self.playlist_buttons
+        elif self.current_tab == "queues":
+            buttons += self.queues_buttons
+        elif self.current_tab == "history":
+            buttons.append(self.history_search_btn)
+        elif self.current_tab == "now_playing":
+            buttons += self.now_play_btns
+        return buttons
+    
+    def hover_targets(self):
+        # An open modal captures the mouse, so only its buttons can be hovered
+        if self.modal:
+            modal_type = self.modal.get('type')
+            if modal_type == 'text':
+                return [self.modal['confirm'], self.modal['cancel']]
+            if modal_type == 'song_select':
+                return [self.modal['cancel']]
+            if modal_type == 'confirm':
+                return [self.modal['yes'], self.modal['no']]
+            return []
+        return self.current_buttons()
+    
+    def update_hover(self, pos):
+        hovered = None
+        for btn in self.hover_targets():
+            if btn.hit(pos):
+                hovered = btn
+                break
+        if hovered is not self.hovered_button:
+            if self.hovered_button:
+                self.hovered_button.hovered = False
+            if hovered:
+                hovered.hovered = True
+            self.hovered_button = hovered
+            self.needs_redraw = True
+    
+    def is_animating(self):
+        # Anything that needs frames to keep coming without input
+        return (self.message_timer > 0 or bool(self._pending_refresh) or self.music_manager.scanning
+                or (self.current_tab == "now_playing" and self.current_duration > 0))
     
-    def handle_events(self):
+    def next_events(self):
+        if self.is_animating():
+            return pygame.event.get()
+        # Idle: sleep until input arrives instead of spinning at full frame rate
+        event = pygame.event.wait(IDLE_WAIT)
+        if event.type == NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+    
+    def handle_events(self, events=None):
         pos = pygame.mouse.get_pos()
-        for event in pygame.event.get():
+        hover_pos = None
+        for event in pygame.event.get() if events is None else events:
+            if event.type in (MOUSEMOTION, MOUSEBUTTONDOWN):
+                # Clicks can change which buttons are on screen, so re-check hover after them too
+                hover_pos = event.pos
+            if event.type not in (MOUSEMOTION, REFRESH_EVENT):
+                self.needs_redraw = True
             if event.type == QUIT:
                 self.running = False
             elif event.type == MUSIC_END:
@@ -548,7 +985,14 @@ class GUIMusicPlayer:
                     else:
                         self.playing_playlist = None
                     self.update_now_playing()
-                    self.refresh_history()
+                    self._schedule('history', self.refresh_history)
+            elif event.type == REFRESH_EVENT:
+                # Only redraw when the status text actually changed
+                if self.current_tab == "status" and self.refresh_status():
+                    self.needs_redraw = True
+            elif event.type == WINDOWEXPOSED:
+                # The window contents were lost, so push the whole screen next frame
+                self.dirty_rects.append(self.screen.get_rect())
             elif event.type == MOUSEWHEEL:
                 if self.modal and self.modal.get('type') == 'song_select':
                     self.modal['list'].handle_scroll(event.y)
@@ -574,7 +1018,7 @@ class GUIMusicPlayer:
             # Tab buttons
             for i, btn in enumerate(self.tab_buttons):
                 if btn.handle_event(event, pos):
-                    self.current_tab = self.tabs[i].lower().replace(" ", "_")
+                    self.current_tab = self._tab_keys[i]
                     if self.current_tab == "status":
                         self.refresh_status()
                     break
@@ -590,231 +1034,297 @@ class GUIMusicPlayer:
                 pass
             elif self.current_tab == "now_playing":
                 self.handle_now_playing(event, pos)
+        if hover_pos is not None:
+            self.update_hover(hover_pos)
     
     def handle_library(self, event, pos):
         if self.library_all_btn.handle_event(event, pos):
             self.library_view = 'all'
             self.selected_artist = None
             self.selected_file_type = None
-            self.refresh_library()
+            self._schedule('library', self.refresh_library)
         elif self.library_artist_btn.handle_event(event, pos):
             self.library_view = 'artists'
             self.selected_artist = None
-            self.refresh_library()
+            self._schedule('library', self.refresh_library)
         elif self.library_type_btn.handle_event(event, pos):
             self.library_view = 'file_types'
             self.selected_file_type = None
-            self.refresh_library()
+            self._schedule('library', self.refresh_library)
         elif self.library_stats_btn.handle_event(event, pos):
             self.library_view = 'stats'
-            self.refresh_library()
+            self._schedule('library', self.refresh_library)
         elif self.library_back_btn.handle_event(event, pos) and (self.selected_artist or self.selected_file_type):
             self.selected_artist = None
             self.selected_file_type = None
-            self.refresh_library()
+            self._schedule('library', self.refresh_library)
         elif self.library_search_btn.handle_event(event, pos):
             query = self.library_search_input.text
             if query:
-                results = self.music_manager.search_songs(query)
-                self.library_list.set_items(results)
-        self.library_search_input.handle_event(event)
+                self._schedule('library', self.search_library, query)
+        if self.library_search_input.handle_event(event) and event.type == KEYDOWN:
+            # Search as the user types, once they pause
+            self._schedule('library', self.search_library, self.library_search_input.text, delay_frames=SEARCH_DELAY_FRAMES)
         if event.type == MOUSEBUTTONDOWN:
             selected = self.library_list.handle_click(pos)
             if selected:
                 if self.library_view == 'artists' and not self.selected_artist:
                     self.selected_artist = selected
-                    self.refresh_library()
+                    self._schedule('library', self.refresh_library)
                 elif self.library_view == 'file_types' and not self.selected_file_type:
                     self.selected_file_type = selected
-                    self.refresh_library()
+                    self._schedule('library', self.refresh_library)
                 elif isinstance(selected, dict):
                     self.stacks_queues_player.play_song(selected)
                     self.playing_playlist = None
                     self.update_now_playing()
                     self.show_message(f"Playing: {selected['title']}")
-                    self.refresh_history()
+                    self._schedule('history', self.refresh_history)
     
     def handle_playlists(self, event, pos):
         if event.type == MOUSEBUTTONDOWN:
             pl_selected = self.playlists_list.handle_click(pos)
             if pl_selected:
                 self.playlist_manager.switch_playlist(pl_selected)
-                self.refresh_playlists()
+                self._schedule('playlists', self.refresh_playlists)
                 self.show_message(f"🔄 Switched to playlist: '{pl_selected}'")
             song_selected = self.playlist_songs_list.handle_click(pos)
             if song_selected:
                 current_pl = self.playlist_manager.get_current_playlist()
                 if current_pl:
-                    curr = current_pl.head
-                    for _ in range(self.playlist_songs_list.selected_index):
-                        curr = curr.next
-                    current_pl.current_node = curr
+                    current_pl.current_node = current_pl.node_at(self.playlist_songs_list.selected_index)
                     self.stacks_queues_player.play_song(song_selected)
                     self.playing_playlist = current_pl
                     self.update_now_playing()
                     self.show_message(f"Playing: {song_selected['title']}")
-                    self.refresh_history()
-        btns = self.playlist_buttons
-        if btns[0].handle_event(event, pos):  # List All
-            self.refresh_playlists()
-        elif btns[1].handle_event(event, pos):  # Create New
-            self.show_modal_text("Enter playlist name", lambda name, desc: (self.playlist_manager.create_playlist(name) or self.playlist_descriptions.update({name: desc}) or self.refresh_playlists() or self.save_playlists() or self.show_message(f"✅ Created new playlist: '{name}'")), has_desc=True)
-        elif btns[2].handle_event(event, pos):  # Create from Lib
-            self.show_modal_text("Enter playlist name", lambda name, desc: self.show_modal_text("Enter max songs", lambda max_s, _: (self.playlist_manager.create_playlist_from_library(name, self.music_manager, int(max_s or 10)) or self.playlist_descriptions.update({name: desc}) or self.refresh_playlists() or self.save_playlists() or self.show_message(f"✅ Created playlist from library: '{name}'")), has_desc=True, numeric=True))
-        elif btns[3].handle_event(event, pos):  # Switch
-            selected = self.playlists_list.selected_index
-            if selected >= 0:
-                name = self.playlists_list.items[selected]
-                self.playlist_manager.switch_playlist(name)
-                self.refresh_playlists()
-                self.show_message(f"🔄 Switched to playlist: '{name}'")
-        elif btns[4].handle_event(event, pos):  # Delete
-            selected = self.playlists_list.selected_index
-            if selected >= 0:
-                name = self.playlists_list.items[selected]
-                self.show_modal_confirm(f"Delete '{name}'?", lambda: (self.playlist_manager.delete_playlist(name) or self.playlist_descriptions.pop(name, None) or self.refresh_playlists() or self.save_playlists() or self.show_message(f"🗑️ Deleted playlist: '{name}'")))
-        elif btns[5].handle_event(event, pos):  # Add Song
-            self.show_modal_song_select(lambda song: (self.playlist_manager.add_song_to_current_playlist(song) or self.refresh_playlists() or self.save_playlists() or self.show_message(f"✅ Added song: {song['title']}")))
-        elif btns[6].handle_event(event, pos):  # Insert After
-            current_pl = self.playlist_manager.get_current_playlist()
-            if current_pl and current_pl.get_current_song():
-                target = current_pl.get_current_song()['title']
-                self.show_modal_song_select(lambda song: (current_pl.insert_song_after(target, song) or self.refresh_playlists() or self.save_playlists() or self.show_message(f"✅ Inserted song: {song['title']} after {target}")), "Select song to insert after current")
-            else:
-                self.show_message("No current song")
-        elif btns[7].handle_event(event, pos):  # Remove Song
-            selected = self.playlist_songs_list.selected_index
-            if selected >= 0:
-                title = self.playlist_songs_list.items[selected]['title']
-                current_pl = self.playlist_manager.get_current_playlist()
-                if current_pl:
-                    current_pl.remove_song(title)
-                    self.refresh_playlists()
-                    self.save_playlists()
-                    self.show_message(f"🗑️ Removed song: {title}")
-        elif btns[8].handle_event(event, pos):  # Search Song
-            self.show_modal_text("Enter search term", lambda query, _: self.playlist_songs_list.set_items(current_pl.search_song(query) or []) if (current_pl := self.playlist_manager.get_current_playlist()) else self.show_message("No playlist"))
-        elif btns[9].handle_event(event, pos):  # Shuffle
-            current_pl = self.playlist_manager.get_current_playlist()
-            if current_pl:
-                current_pl.shuffle_playlist()
-                self.refresh_playlists()
-                self.save_playlists()
-                self.show_message("🔀 Shuffled playlist")
-        elif btns[10].handle_event(event, pos):  # Play Playlist
-            current_pl = self.playlist_manager.get_current_playlist()
-            if current_pl:
-                if not current_pl.get_current_song():
-                    current_pl.go_to_first_song()
-                song = current_pl.get_current_song()
-                if song:
-                    self.stacks_queues_player.play_song(song)
-                    self.playing_playlist = current_pl
-                    self.update_now_playing()
-                    self.refresh_history()
-                    self.show_message(f"Playing: {song['title']}")
-        elif btns[11].handle_event(event, pos):  # Display
-            self.refresh_playlists()
-        elif btns[12].handle_event(event, pos):  # First Song
+                    self._schedule('history', self.refresh_history)
+        self.dispatch_buttons(event, pos, self._playlist_rects, self._playlist_handlers)
+    
+    def dispatch_buttons(self, event, pos, rects, handlers):
+        # Only clicks can trigger a button, so skip the hit tests for everything else
+        if event.type != MOUSEBUTTONDOWN:
+            return False
+        idx = _hit(rects, pos)
+        if idx < 0:
+            return False
+        handlers[idx]()
+        return True
+    
+    def _pl_list_all(self):
+        self._schedule('playlists', self.refresh_playlists)
+    
+    def _pl_create_new(self):
+        self.show_modal_text("Enter playlist name", self._create_playlist, has_desc=True)
+    
+    def _create_playlist(self, name, desc):
+        if self.playlist_manager.create_playlist(name):
+            self.playlist_descriptions[name] = desc
+            self._schedule('playlists', self.refresh_playlists)
+            self._schedule_save()
+            self.show_message(f"✅ Created new playlist: '{name}'")
+        else:
+            self.show_message(f"Playlist '{name}' already exists")
+    
+    def _pl_create_from_library(self):
+        self.show_modal_text("Enter playlist name", lambda name, desc: self.show_modal_text(
+            "Enter max songs", lambda max_s, _: self._create_playlist_from_library(name, desc, int(max_s or 10)), numeric=True), has_desc=True)
+    
+    def _create_playlist_from_library(self, name, desc, max_songs):
+        if self.playlist_manager.create_playlist_from_library(name, self.music_manager, max_songs):
+            self.playlist_descriptions[name] = desc
+            self._schedule('playlists', self.refresh_playlists)
+            self._schedule_save()
+            self.show_message(f"✅ Created playlist from library: '{name}'")
+        else:
+            self.show_message(f"Could not create playlist '{name}'")
+    
+    def _pl_switch(self):
+        selected = self.playlists_list.selected_index
+        if selected >= 0:
+            name = self.playlists_list.items[selected]
+            self.playlist_manager.switch_playlist(name)
+            self._schedule('playlists', self.refresh_playlists)
+            self.show_message(f"🔄 Switched to playlist: '{name}'")
+    
+    def _pl_delete(self):
+        selected = self.playlists_list.selected_index
+        if selected >= 0:
+            name = self.playlists_list.items[selected]
+            self.show_modal_confirm(f"Delete '{name}'?", lambda: self._delete_playlist(name))
+    
+    def _delete_playlist(self, name):
+        if self.playlist_manager.delete_playlist(name):
+            self.playlist_descriptions.pop(name, None)
+            self._schedule('playlists', self.refresh_playlists)
+            self._schedule_save()
+            self.show_message(f"🗑️ Deleted playlist: '{name}'")
+    
+    def _pl_add_song(self):
+        self.show_modal_song_select(self._add_song_to_playlist)
+    
+    def _add_song_to_playlist(self, song):
+        if self.playlist_manager.add_song_to_current_playlist(song):
+            self._schedule('playlists', self.refresh_playlists)
+            self._schedule_save()
+            self.show_message(f"✅ Added song: {song['title']}")
+        else:
+            self.show_message("No playlist selected")
+    
+    def _pl_insert_after(self):
+        current_pl = self.playlist_manager.get_current_playlist()
+        if current_pl and current_pl.get_current_song():
+            target = current_pl.get_current_song()['title']
+            self.show_modal_song_select(lambda song: self._insert_song_after(current_pl, target, song), "Select song to insert after current")
+        else:
+            self.show_message("No current song")
+    
+    def _insert_song_after(self, playlist, target, song):
+        if playlist.insert_song_after(target, song):
+            self._schedule('playlists', self.refresh_playlists)
+            self._schedule_save()
+            self.show_message(f"✅ Inserted song: {song['title']} after {target}")
+    
+    def _pl_remove_song(self):
+        selected = self.playlist_songs_list.selected_index
+        if selected >= 0:
+            title = self.playlist_songs_list.items[selected]['title']
             current_pl = self.playlist_manager.get_current_playlist()
             if current_pl:
+                current_pl.remove_song(title)
+                self._schedule('playlists', self.refresh_playlists)
+                self._schedule_save()
+                self.show_message(f"🗑️ Removed song: {title}")
+    
+    def _pl_search_song(self):
+        if self.playlist_manager.get_current_playlist():
+            self.show_modal_text("Enter search term", lambda query, _: self._search_playlist(query))
+        else:
+            self.show_message("No playlist")
+    
+    def _search_playlist(self, query):
+        current_pl = self.playlist_manager.get_current_playlist()
+        node = current_pl.search_song(query) if current_pl else None
+        if node:
+            # Jump to the first match and highlight it in the song list
+            current_pl.current_node = node
+            self.refresh_current_index()
+            self.show_message(f"🔍 Found: {node.song_data['title']} - {node.song_data['artist']}")
+        else:
+            self.show_message(f"No song matching '{query}'")
+    
+    def _pl_shuffle(self):
+        current_pl = self.playlist_manager.get_current_playlist()
+        if current_pl:
+            current_pl.shuffle_playlist()
+            self._schedule('playlists', self.refresh_playlists)
+            self._schedule_save()
+            self.show_message("🔀 Shuffled playlist")
+    
+    def _pl_play(self):
+        current_pl = self.playlist_manager.get_current_playlist()
+        if current_pl:
+            if not current_pl.get_current_song():
                 current_pl.go_to_first_song()
-                self.refresh_playlists()
-        elif btns[13].handle_event(event, pos):  # Last Song
-            current_pl = self.playlist_manager.get_current_playlist()
-            if current_pl:
-                current_pl.go_to_last_song()
-                self.refresh_playlists()
-        elif btns[14].handle_event(event, pos):  # Next Song
-            current_pl = self.playlist_manager.get_current_playlist()
-            if current_pl:
-                current_pl.next_song()
-                self.refresh_playlists()
-        elif btns[15].handle_event(event, pos):  # Prev Song
-            current_pl = self.playlist_manager.get_current_playlist()
-            if current_pl:
-                current_pl.previous_song()
-                self.refresh_playlists()
+            song = current_pl.get_current_song()
+            if song:
+                self.stacks_queues_player.play_song(song)
+                self.playing_playlist = current_pl
+                self.update_now_playing()
+                self._schedule('history', self.refresh_history)
+                self.show_message(f"Playing: {song['title']}")
+    
+    def _pl_first_song(self):
+        current_pl = self.playlist_manager.get_current_playlist()
+        if current_pl:
+            current_pl.go_to_first_song()
+            self._schedule('playlist_index', self.refresh_current_index)
+    
+    def _pl_last_song(self):
+        current_pl = self.playlist_manager.get_current_playlist()
+        if current_pl:
+            current_pl.go_to_last_song()
+            self._schedule('playlist_index', self.refresh_current_index)
+    
+    def _pl_next_song(self):
+        current_pl = self.playlist_manager.get_current_playlist()
+        if current_pl:
+            current_pl.next_song()
+            self._schedule('playlist_index', self.refresh_current_index)
+    
+    def _pl_prev_song(self):
+        current_pl = self.playlist_manager.get_current_playlist()
+        if current_pl:
+            current_pl.previous_song()
+            self._schedule('playlist_index', self.refresh_current_index)
     
     def handle_queues(self, event, pos):
         if event.type == MOUSEBUTTONDOWN:
             self.play_next_list.handle_click(pos)
             self.party_list.handle_click(pos)
-        btns = self.queues_buttons
-        if btns[0].handle_event(event, pos):  # Add to Next
-            self.show_modal_song_select(lambda song: (self.stacks_queues_player.add_to_play_next(song) or self.refresh_queues() or self.show_message(f"✅ Added to Play Next: {song['title']}")))
-        elif btns[1].handle_event(event, pos):  # Play Next
-            self.stacks_queues_player.play_next_song()
-            self.refresh_queues()
-            self.update_now_playing()
-            self.refresh_history()
-        elif btns[2].handle_event(event, pos):  # Clear Next
-            self.stacks_queues_player.play_next_queue.clear_queue()
-            self.refresh_queues()
-            self.show_message("🗑️ Cleared Play Next queue")
-        elif btns[3].handle_event(event, pos):  # Add to Party
-            self.show_modal_song_select(lambda song: self.show_modal_text("Enter priority", lambda pri, _: (self.stacks_queues_player.add_to_party_queue(song, int(pri or 0)) or self.refresh_queues() or self.show_message(f"✅ Added to Party Queue: {song['title']}")), numeric=True))
-        elif btns[4].handle_event(event, pos):  # Upvote
-            selected = self.party_list.selected_index
-            if selected >= 0:
-                title = self.stacks_queues_player.party_queue.queue[selected][0]['title']
-                self.stacks_queues_player.upvote_song_in_party_queue(title)
-                self.refresh_queues()
-                self.show_message(f"⬆️ Upvoted: {title}")
-        elif btns[5].handle_event(event, pos):  # Play Party
-            self.stacks_queues_player.play_from_party_queue()
-            self.refresh_queues()
-            self.update_now_playing()
-            self.refresh_history()
-        elif btns[6].handle_event(event, pos):  # Clear Party
-            self.stacks_queues_player.party_queue.clear_queue()
-            self.refresh_queues()
-            self.show_message("🗑️ Cleared Party Queue")
-        elif btns[7].handle_event(event, pos):  # View History
-            self.refresh_history()
-        elif btns[8].handle_event(event, pos):  # Search History
-            self.show_modal_text("Enter search term", lambda query, _: self.refresh_history(query))
+        self.dispatch_buttons(event, pos, self._queue_rects, self._queue_handlers)
+    
+    def _q_add_to_next(self):
+        self.show_modal_song_select(self._add_to_play_next)
+    
+    def _add_to_play_next(self, song):
+        self.stacks_queues_player.add_to_play_next(song)
+        self._schedule('queues', self.refresh_queues)
+        self.show_message(f"✅ Added to Play Next: {song['title']}")
+    
+    def _q_play_next(self):
+        self.stacks_queues_player.play_next_song()
+        self._schedule('queues', self.refresh_queues)
+        self.update_now_playing()
+        self._schedule('history', self.refresh_history)
+    
+    def _q_clear_next(self):
+        self.stacks_queues_player.play_next_queue.clear_queue()
+        self._schedule('queues', self.refresh_queues)
+        self.show_message("🗑️ Cleared Play Next queue")
+    
+    def _q_add_to_party(self):
+        self.show_modal_song_select(lambda song: self.show_modal_text(
+            "Enter priority", lambda pri, _: self._add_to_party_queue(song, int(pri or 0)), numeric=True))
+    
+    def _add_to_party_queue(self, song, priority):
+        self.stacks_queues_player.add_to_party_queue(song, priority)
+        self._schedule('queues', self.refresh_queues)
+        self.show_message(f"✅ Added to Party Queue: {song['title']}")
+    
+    def _q_upvote(self):
+        selected = self.party_list.selected_index
+        if selected >= 0:
+            title = self.stacks_queues_player.party_queue.queue[selected][0]['title']
+            self.stacks_queues_player.upvote_song_in_party_queue(title)
+            self._schedule('queues', self.refresh_queues)
+            self.show_message(f"⬆️ Upvoted: {title}")
+    
+    def _q_play_party(self):
+        self.stacks_queues_player.play_from_party_queue()
+        self._schedule('queues', self.refresh_queues)
+        self.update_now_playing()
+        self._schedule('history', self.refresh_history)
+    
+    def _q_clear_party(self):
+        self.stacks_queues_player.party_queue.clear_queue()
+        self._schedule('queues', self.refresh_queues)
+        self.show_message("🗑️ Cleared Party Queue")
+    
+    def _q_view_history(self):
+        self._schedule('history', self.refresh_history)
+    
+    def _q_search_history(self):
+        self.show_modal_text("Enter search term", lambda query, _: self._schedule('history', self.refresh_history, query))
     
     def handle_history(self, event, pos):
         if self.history_search_btn.handle_event(event, pos):
             query = self.history_search_input.text
-            self.refresh_history(query)
-        self.history_search_input.handle_event(event)
+            self._schedule('history', self.refresh_history, query)
+        if self.history_search_input.handle_event(event) and event.type == KEYDOWN:
+            self._schedule('history', self.refresh_history, self.history_search_input.text, delay_frames=SEARCH_DELAY_FRAMES)
     
     def handle_now_playing(self, event, pos):
-        btns = self.now_play_btns
-        if btns[0].handle_event(event, pos):  # Play/Pause
-            if pygame.mixer.music.get_busy():
-                pygame.mixer.music.pause()
-            else:
-                pygame.mixer.music.unpause()
-            self.update_now_playing()
-        elif btns[1].handle_event(event, pos):  # Stop
-            self.stacks_queues_player.stop_song()
-            self.playing_playlist = None
-            self.update_now_playing()
-        elif btns[2].handle_event(event, pos):  # Next
-            if self.playing_playlist:
-                self.playing_playlist.next_song()
-                song = self.playing_playlist.get_current_song()
-                if song:
-                    self.stacks_queues_player.play_song(song)
-                    self.update_now_playing()
-                    self.refresh_history()
-                    self.show_message(f"Playing: {song['title']}")
-            else:
-                self.stacks_queues_player.play_next_song()
-                self.update_now_playing()
-                self.refresh_history()
-        elif btns[3].handle_event(event, pos):  # Prev
-            if self.playing_playlist:
-                self.playing_playlist.previous_song()
-                song = self.playing_playlist.get_current_song()
-                if song:
-                    self.stacks_queues_player.play_song(song)
-                    self.update_now_playing()
-                    self.refresh_history()
-                    self.show_message(f"Playing: {song['title']}")
+        self.dispatch_buttons(event, pos, self._now_playing_rects, self._now_playing_handlers)
         if event.type == MOUSEBUTTONDOWN and self.volume_slider.collidepoint(pos):
             rel_x = (pos[0] - self.volume_slider.x) / self.volume_slider.width
             self.volume = max(0, min(1, rel_x))
@@ -824,95 +1334,139 @@ class GUIMusicPlayer:
             new_pos = rel_x * (self.current_duration / 1000)
             pygame.mixer.music.set_pos(new_pos)
     
+    def _np_play_pause(self):
+        if pygame.mixer.music.get_busy():
+            pygame.mixer.music.pause()
+        else:
+            pygame.mixer.music.unpause()
+        self.update_now_playing()
+    
+    def _np_stop(self):
+        self.stacks_queues_player.stop_song()
+        self.playing_playlist = None
+        self.update_now_playing()
+    
+    def _np_next(self):
+        if self.playing_playlist:
+            self.playing_playlist.next_song()
+            song = self.playing_playlist.get_current_song()
+            if song:
+                self.stacks_queues_player.play_song(song)
+                self.update_now_playing()
+                self._schedule('history', self.refresh_history)
+                self.show_message(f"Playing: {song['title']}")
+        else:
+            self.stacks_queues_player.play_next_song()
+            self.update_now_playing()
+            self._schedule('history', self.refresh_history)
+    
+    def _np_prev(self):
+        if self.playing_playlist:
+            self.playing_playlist.previous_song()
+            song = self.playing_playlist.get_current_song()
+            if song:
+                self.stacks_queues_player.play_song(song)
+                self.update_now_playing()
+                self._schedule('history', self.refresh_history)
+                self.show_message(f"Playing: {song['title']}")
+    
     def draw(self):
         self.screen.fill(BLACK)
+        dirty = self.dirty_rects
         
         # Title
-        title_surf = self.title_font.render("🎵 Music Streamer", True, BLUE)
-        self.screen.blit(title_surf, (SCREEN_WIDTH//2 - title_surf.get_width()//2, 20))
+        dirty.append(self.screen.blit(self._title_surf, (SCREEN_WIDTH//2 - self._title_surf.get_width()//2, 20)))
         
         # Tabs
-        for btn in self.tab_buttons:
-            if btn.text.lower().replace(" ", "_") == self.current_tab:
+        for btn, key in zip(self.tab_buttons, self._tab_keys):
+            if key == self.current_tab:
                 btn.color = GREEN
             else:
                 btn.color = GRAY
-            btn.draw(self.screen)
         
         if self.current_tab == "library":
-            self.library_all_btn.draw(self.screen)
-            self.library_artist_btn.draw(self.screen)
-            self.library_type_btn.draw(self.screen)
-            self.library_stats_btn.draw(self.screen)
-            if self.library_back_btn.text:
-                self.library_back_btn.draw(self.screen)
-            self.library_search_input.draw(self.screen)
-            self.library_search_btn.draw(self.screen)
-            self.library_list.draw(self.screen)
+            dirty.append(self.library_search_input.draw(self.screen))
+            dirty.append(self.library_list.draw(self.screen))
         elif self.current_tab == "playlists":
-            self.playlists_list.draw(self.screen)
-            self.playlist_songs_list.draw(self.screen)
-            for btn in self.playlist_buttons:
-                btn.draw(self.screen)
+            dirty.append(self.playlists_list.draw(self.screen))
+            dirty.append(self.playlist_songs_list.draw(self.screen))
         elif self.current_tab == "queues":
-            self.play_next_list.draw(self.screen)
-            self.party_list.draw(self.screen)
-            for btn in self.queues_buttons:
-                btn.draw(self.screen)
-            next_label = self.font.render("Play Next Queue", True, WHITE)
-            self.screen.blit(next_label, (20, 60))
-            party_label = self.font.render("Party Queue", True, WHITE)
-            self.screen.blit(party_label, (640, 60))
+            dirty.append(self.play_next_list.draw(self.screen))
+            dirty.append(self.party_list.draw(self.screen))
+            dirty.append(self.screen.blit(self._next_label, (20, 60)))
+            dirty.append(self.screen.blit(self._party_label, (640, 60)))
         elif self.current_tab == "history":
-            self.history_display.draw(self.screen)
-            self.history_search_input.draw(self.screen)
-            self.history_search_btn.draw(self.screen)
+            dirty.append(self.history_display.draw(self.screen))
+            dirty.append(self.history_search_input.draw(self.screen))
         elif self.current_tab == "status":
-            self.status_display.draw(self.screen)
+            dirty.append(self.status_display.draw(self.screen))
         elif self.current_tab == "now_playing":
-            label_surf = self.font.render(self.now_playing_label, True, WHITE)
-            self.screen.blit(label_surf, (SCREEN_WIDTH//2 - label_surf.get_width()//2, SCREEN_HEIGHT//2 - 50))
-            for btn in self.now_play_btns:
-                btn.draw(self.screen)
+            label_surf = _render_text(32, self.now_playing_label, WHITE)
+            dirty.append(self.screen.blit(label_surf, (SCREEN_WIDTH//2 - label_surf.get_width()//2, SCREEN_HEIGHT//2 - 50)))
             # Volume slider
             pygame.draw.rect(self.screen, GRAY, self.volume_slider, border_radius=5)
             fill_width = self.volume * self.volume_slider.width
             pygame.draw.rect(self.screen, BLUE, (self.volume_slider.x, self.volume_slider.y, fill_width, self.volume_slider.height), border_radius=5)
-            vol_label = self.small_font.render("Volume", True, WHITE)
-            self.screen.blit(vol_label, (self.volume_slider.x, self.volume_slider.y - 25))
+            dirty.append(self.screen.blit(self._vol_label, (self.volume_slider.x, self.volume_slider.y - 25)))
+            dirty.append(self.volume_slider)
             # Progress bar
             if self.current_duration > 0:
-                pos = pygame.mixer.music.get_pos()
+                pos = self._mixer_pos
                 fill_width = (pos / self.current_duration) * self.progress_rect.width
                 pygame.draw.rect(self.screen, GRAY, self.progress_rect, border_radius=5)
                 pygame.draw.rect(self.screen, GREEN, (self.progress_rect.x, self.progress_rect.y, fill_width, self.progress_rect.height), border_radius=5)
                 # Display time
                 current_time = int(pos / 1000)  # Convert to seconds
                 total_time = int(self.current_duration / 1000)  # Convert to seconds
-                time_label = f"{current_time//60}:{current_time%60:02} / {total_time//60}:{total_time%60:02}"
-                time_surf = self.small_font.render(time_label, True, WHITE)
-                self.screen.blit(time_surf, (self.progress_rect.x, self.progress_rect.y - 25))
+                # The label only changes once a second, so re-render it only then
+                if (current_time, total_time) != self._time_key:
+                    time_label = f"{current_time//60}:{current_time%60:02} / {total_time//60}:{total_time%60:02}"
+                    self._time_surf = self.small_font.render(time_label, WHITE)[0].convert_alpha()
+                    self._time_key = (current_time, total_time)
+                dirty.append(self.screen.blit(self._time_surf, (self.progress_rect.x, self.progress_rect.y - 25)))
+                dirty.append(self.progress_rect)
+        
+        # All of the tab's buttons are drawn in one batch
+        dirty += draw_buttons(self.screen, self.current_buttons())
         
         if self.message_timer > 0:
-            msg_surf = self.small_font.render(self.message, True, YELLOW)
-            self.screen.blit(msg_surf, (20, SCREEN_HEIGHT - 30))
-            self.message_timer -= 1
+            rect = self.screen.blit(self._message_surf, (20, SCREEN_HEIGHT - 30))
+            if self._message_dirty:
+                if self._message_rect:
+                    dirty.append(self._message_rect)  # Clear a longer message being replaced
+                dirty.append(rect)
+                self._message_rect = rect
+                self._message_dirty = False
+        elif self._message_rect:
+            dirty.append(self._message_rect)  # Expired: push the cleared area once
+            self._message_rect = None
         
         if self.modal:
             # Dim background
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            overlay.fill(BLACK)
-            overlay.set_alpha(128)
-            self.screen.blit(overlay, (0, 0))
+            dirty.append(self.screen.blit(self._modal_overlay, (0, 0)))
             self.draw_modal()
         
-        pygame.display.flip()
+        self.present()
+    
+    def present(self):
+        # Push this frame's regions plus last frame's, so anything that
+        # disappeared (tab switch, closed modal, expired message) is cleared too
+        rects = {tuple(r) for r in self.dirty_rects + self._last_dirty_rects}
+        if len(rects) > MAX_DIRTY_RECTS or sum(r[2] * r[3] for r in rects) > MAX_DIRTY_AREA:
+            pygame.display.flip()
+        else:
+            pygame.display.update(list(rects))
+        self._last_dirty_rects = self.dirty_rects
+        self.dirty_rects = []
     
     def run(self):
         try:
             while self.running:
-                self.handle_events()
-                self.draw()
+                self.handle_events(self.next_events())
+                self.update()
+                if self.needs_redraw:
+                    self.draw()
+                    self.needs_redraw = False
                 self.clock.tick(FPS)
         except KeyboardInterrupt:
             print("Music player interrupted. Goodbye!")
@@ -922,6 +1476,10 @@ class GUIMusicPlayer:
             traceback.print_exc()
         finally:
             self.save_playlists()  # Save playlists before exiting
+            # Queued probes return at once; a probe mid-decode is waited for,
+            # so the mixer isn't torn down underneath it
+            self._closing = True
+            self._duration_pool.shutdown(wait=True)
             pygame.quit()
 
 if __name__ == "__main__":
@@ -1,18 +1,58 @@
 import os
 import re
+import sys
+import json
+import hashlib
+import queue
+import threading
+from bisect import insort
+from collections import Counter, defaultdict
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Iterator, Optional, Set, Tuple
+
+# "Artist Name - Song Name", split on the first " - " like str.split(' - ', 1)
+_NAME_RE = re.compile(r'(.*?) - (.*)', re.DOTALL)
+
+# Supported audio file extensions
+AUDIO_EXTENSIONS = {'.mp3', '.flac', '.wav', '.m4a', '.ogg'}
+
+# Parsed-library caches live in the per-user cache directory, never in the music folder
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or os.environ.get('LOCALAPPDATA')
+                 or Path.home() / '.cache') / 'music_streamer'
 
 class MusicPlaylistManager:
-    def __init__(self, music_directory: str):
+    def __init__(self, music_directory: str, load: bool = True):
         """Initialize the Music Playlist Manager with a music directory."""
         self.music_directory = Path(music_directory)
+        # One cache file per music directory, named after its absolute path
+        dir_hash = hashlib.sha1(str(self.music_directory.resolve()).encode('utf-8')).hexdigest()[:16]
+        self._cache_path = CACHE_DIR / f"library-{dir_hash}.json"
+        # Cache contents read ahead of a scan by cached_file_paths(), handed to the next scan
+        self._cache: Optional[Dict[str, Dict]] = None
         self.song_library = []
         self.artists = set()
         self.file_types = set()
+        # Sorted copies of artists/file_types, kept in order as songs are added
+        self._sorted_artists: List[str] = []
+        self._sorted_file_types: List[str] = []
+        # Per-field columns, index-aligned with song_library, for search scans
+        self._title_keys: List[str] = []
+        self._artist_keys: List[str] = []
+        # Running totals kept up to date as songs are added, for statistics
+        self._total_size = 0
+        self._artist_counts: Counter = Counter()
+        # Songs grouped by lowercased artist and by file type, in library order
+        self._by_artist: Dict[str, List[Dict]] = {}
+        self._by_type: Dict[str, List[Dict]] = {}
+        # Lowercased title/artist trigram -> indices of songs containing it
+        self._trigram_index: Dict[str, Set[int]] = defaultdict(set)
+        # Batches of songs handed over by a background scan (None marks the end)
+        self._scan_queue: queue.Queue = queue.Queue()
+        self.scanning = False
         
-        # Load the music library on startup
-        self.load_music_library()
+        # Load the music library on startup, unless the caller will scan asynchronously
+        if load:
+            self.load_music_library()
         
     def load_music_library(self) -> None:
         """Load all music files from the music directory into the library."""
@@ -20,35 +60,167 @@ class MusicPlaylistManager:
             print(f"Error: Music directory '{self.music_directory}' does not exist.")
             return
             
-        # Supported audio file extensions
-        audio_extensions = {'.mp3', '.flac', '.wav', '.m4a', '.ogg'}
-        
         print("Loading music library...")
         
-        for file_path in self.music_directory.iterdir():
-            if file_path.is_file() and file_path.suffix.lower() in audio_extensions:
-                song_info = self._extract_song_info(file_path)
-                if song_info:
-                    self.song_library.append(song_info)
-                    self.artists.add(song_info['artist'])
-                    self.file_types.add(song_info['file_type'])
+        self._reset_library()
+        for song_info in self._scan_files():
+            self._add_song(song_info)
                     
         print(f"Loaded {len(self.song_library)} songs from the music library.")
         
+    def scan_async(self, batch_size: int = 500) -> None:
+        """Start loading the library on a background thread; collect songs with drain_scan()."""
+        self._reset_library()
+        self._scan_queue = queue.Queue()
+        self.scanning = True
+        threading.Thread(target=self._scan_worker, args=(self._scan_queue, batch_size), daemon=True).start()
+        
+    def _scan_worker(self, scan_queue: queue.Queue, batch_size: int) -> None:
+        """Scan the music directory, publishing songs in batches."""
+        batch = []
+        try:
+            if not self.music_directory.exists():
+                print(f"Error: Music directory '{self.music_directory}' does not exist.")
+                return
+            for song_info in self._scan_files():
+                batch.append(song_info)
+                if len(batch) >= batch_size:
+                    scan_queue.put(batch)
+                    batch = []
+        finally:
+            if batch:
+                scan_queue.put(batch)
+            scan_queue.put(None)
+        
+    def drain_scan(self) -> List[Dict]:
+        """Add songs published by the background scan so far; returns the songs added."""
+        added = []
+        while True:
+            try:
+                batch = self._scan_queue.get_nowait()
+            except queue.Empty:
+                break
+            if batch is None:
+                self.scanning = False
+                break
+            for song_info in batch:
+                self._add_song(song_info)
+            added.extend(batch)
+        return added
+        
+    def _reset_library(self) -> None:
+        """Empty the library and all of its derived views."""
+        # Reloading rebuilds the library rather than appending duplicates
+        self.song_library = []
+        self.artists = set()
+        self.file_types = set()
+        self._sorted_artists = []
+        self._sorted_file_types = []
+        self._title_keys = []
+        self._artist_keys = []
+        self._total_size = 0
+        self._artist_counts = Counter()
+        self._by_artist = {}
+        self._by_type = {}
+        self._trigram_index = defaultdict(set)
+        
+    def _scan_files(self) -> Iterator[Dict]:
+        """Yield song information for each audio file in the music directory."""
+        # Songs parsed on a previous run are reused if the file's size and mtime are unchanged
+        cached = self._cache if self._cache is not None else self._load_library_cache()
+        self._cache = None
+        changed = False
+        songs = []
+        mtimes = []
+        with os.scandir(self.music_directory) as entries:
+            for entry in entries:
+                # DirEntry answers is_file() from the directory listing, and caches stat()
+                if not entry.is_file():
+                    continue
+                name, ext = os.path.splitext(entry.name)
+                file_type = ext.lower()
+                if file_type not in AUDIO_EXTENSIONS:
+                    continue
+                stat = entry.stat()
+                song_info = cached.pop(entry.path, None)
+                if (song_info is None or song_info.pop('mtime_ns', None) != stat.st_mtime_ns
+                        or song_info['file_size'] != stat.st_size):
+                    song_info = self._extract_song_info_fast(name, file_type, entry.path, stat.st_size)
+                    changed = True
+                songs.append(song_info)
+                mtimes.append(stat.st_mtime_ns)
+                yield song_info
+        if changed or cached:
+            self._save_library_cache(songs, mtimes)
+        
+    def _add_song(self, song_info: Dict) -> None:
+        """Append a song to the library and its column views."""
+        # Artist names and file types repeat across songs; share one string per value
+        song_info['artist'] = sys.intern(song_info['artist'])
+        song_info['file_type'] = sys.intern(song_info['file_type'])
+        self.song_library.append(song_info)
+        if song_info['artist'] not in self.artists:
+            self.artists.add(song_info['artist'])
+            insort(self._sorted_artists, song_info['artist'])
+        if song_info['file_type'] not in self.file_types:
+            self.file_types.add(song_info['file_type'])
+            insort(self._sorted_file_types, song_info['file_type'])
+        title_key = song_info['title'].lower()
+        artist_key = song_info['artist'].lower()
+        self._title_keys.append(title_key)
+        self._artist_keys.append(artist_key)
+        self._total_size += song_info['file_size']
+        self._artist_counts[song_info['artist']] += 1
+        self._by_artist.setdefault(artist_key, []).append(song_info)
+        self._by_type.setdefault(song_info['file_type'], []).append(song_info)
+        
+        index = len(self.song_library) - 1
+        for text in (title_key, artist_key):
+            for i in range(len(text) - 2):
+                self._trigram_index[text[i:i + 3]].add(index)
+        
+    def cached_file_paths(self) -> Set[str]:
+        """Return the file paths recorded by the last scan, without touching the music directory."""
+        if self._cache is None:
+            self._cache = self._load_library_cache()
+        return set(self._cache)
+        
+    def _load_library_cache(self) -> Dict[str, Dict]:
+        """Load previously parsed songs keyed by file path."""
+        try:
+            with open(self._cache_path, 'r', encoding='utf-8') as f:
+                return {song['file_path']: song for song in json.load(f)}
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+        
+    def _save_library_cache(self, songs: List[Dict], mtimes: List[int]) -> None:
+        """Write the parsed library, with each file's mtime, to the cache for the next startup."""
+        entries = []
+        for song, mtime_ns in zip(songs, mtimes):
+            entry = {key: song[key] for key in ('filename', 'title', 'artist', 'file_type', 'file_path', 'file_size')}
+            entry['mtime_ns'] = mtime_ns
+            entries.append(entry)
+        tmp_path = self._cache_path.with_suffix('.tmp')
+        try:
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f)
+            tmp_path.replace(self._cache_path)
+        except OSError:
+            pass  # An unwritable cache directory just means no cache
+        
     def _extract_song_info(self, file_path: Path) -> Dict:
         """Extract song information from filename with format 'Artist Name - Song Name'."""
-        filename = file_path.stem
-        file_type = file_path.suffix.lower()
+        return self._extract_song_info_fast(file_path.stem, file_path.suffix.lower(),
+                                            str(file_path), file_path.stat().st_size)
         
+    def _extract_song_info_fast(self, filename: str, file_type: str, file_path: str, file_size: int) -> Dict:
+        """Build song information from an already split filename and known file size."""
         # Parse filename with format "Artist Name - Song Name"
-        if ' - ' in filename:
-            parts = filename.split(' - ', 1)
-            if len(parts) == 2:
-                artist = parts[0].strip()
-                title = parts[1].strip()
-            else:
-                artist = "Unknown Artist"
-                title = filename
+        match = _NAME_RE.fullmatch(filename)
+        if match:
+            artist = match.group(1).strip()
+            title = match.group(2).strip()
         else:
             # If no separator found, treat entire filename as title
             artist = "Unknown Artist"
@@ -59,8 +231,8 @@ class MusicPlaylistManager:
             'title': title,
             'artist': artist,
             'file_type': file_type,
-            'file_path': str(file_path),
-            'file_size': file_path.stat().st_size
+            'file_path': file_path,
+            'file_size': file_size
         }
             
     def get_song_library(self) -> List[Dict]:
@@ -69,60 +241,59 @@ class MusicPlaylistManager:
         
     def filter_songs_by_artist(self, artist: str) -> List[Dict]:
         """Filter songs by a specific artist."""
-        return [song for song in self.song_library if song['artist'].lower() == artist.lower()]
+        return list(self._by_artist.get(artist.lower(), []))
         
     def filter_songs_by_file_type(self, file_type: str) -> List[Dict]:
         """Filter songs by file type."""
-        return [song for song in self.song_library if song['file_type'] == file_type.lower()]
+        return list(self._by_type.get(file_type.lower(), []))
     
     def search_songs(self, query: str) -> List[Dict]:
         """Search songs by title or artist."""
         query_lower = query.lower()
-        results = []
-        for song in self.song_library:
-            if (query_lower in song['title'].lower() or 
-                query_lower in song['artist'].lower()):
-                results.append(song)
-        return results
+        library = self.song_library
+        title_keys = self._title_keys
+        artist_keys = self._artist_keys
+        
+        if len(query_lower) < 3:
+            # Too short to have trigrams, check every song
+            candidates = range(len(library))
+        else:
+            # Only songs containing every trigram of the query can match
+            postings = [self._trigram_index.get(query_lower[i:i + 3])
+                        for i in range(len(query_lower) - 2)]
+            if not all(postings):
+                return []
+            postings.sort(key=len)
+            candidates = sorted(postings[0].intersection(*postings[1:]))
+        
+        # Confirm the substring on the lowercased columns (trigrams can match out of order)
+        return [library[i] for i in candidates
+                if query_lower in title_keys[i] or query_lower in artist_keys[i]]
         
     def get_artists_list(self) -> List[str]:
         """Get a list of all artists in the library."""
-        return sorted(list(self.artists))
+        return list(self._sorted_artists)
         
     def get_file_types_list(self) -> List[str]:
         """Get a list of all file types in the library."""
-        return sorted(list(self.file_types))
+        return list(self._sorted_file_types)
         
     def generate_artist_report(self) -> Dict[str, List[Dict]]:
         """Generate a report organized by artist."""
-        report = {}
-        for artist in self.artists:
-            report[artist] = self.filter_songs_by_artist(artist)
-        return report
+        return {artist: list(self._by_artist[artist.lower()]) for artist in self.artists}
         
     def generate_file_type_report(self) -> Dict[str, List[Dict]]:
         """Generate a report organized by file type."""
-        report = {}
-        for file_type in self.file_types:
-            report[file_type] = self.filter_songs_by_file_type(file_type)
-        return report
+        return {file_type: list(songs) for file_type, songs in self._by_type.items()}
         
     def get_library_statistics(self) -> Dict:
         """Get comprehensive statistics about the music library."""
         total_songs = len(self.song_library)
-        total_size = sum(song['file_size'] for song in self.song_library)
+        total_size = self._total_size
         
-        # Count by artist
-        artist_counts = {}
-        for song in self.song_library:
-            artist = song['artist']
-            artist_counts[artist] = artist_counts.get(artist, 0) + 1
-            
-        # Count by file type
-        file_type_counts = {}
-        for song in self.song_library:
-            file_type = song['file_type']
-            file_type_counts[file_type] = file_type_counts.get(file_type, 0) + 1
+        # Counts are maintained as songs load, so no pass over the library is needed
+        artist_counts = self._artist_counts
+        file_type_counts = {file_type: len(songs) for file_type, songs in self._by_type.items()}
             
         return {
             'total_songs': total_songs,
@@ -130,7 +301,8 @@ class MusicPlaylistManager:
             'total_size_mb': round(total_size / (1024 * 1024), 2),
             'total_size_gb': round(total_size / (1024 * 1024 * 1024), 2),
             'unique_artists': len(self.artists),
-            'artist_counts': dict(sorted(artist_counts.items(), key=lambda x: x[1], reverse=True)),
+            'artist_counts': dict(artist_counts.most_common()),
+            'artist_counts_top': artist_counts.most_common(10),
             'file_type_counts': file_type_counts
         }
         
@@ -183,7 +355,7 @@ class MusicPlaylistManager:
         print(f"Unique Artists: {stats['unique_artists']}")
         
         print(f"\nTop Artists by Song Count:")
-        for artist, count in list(stats['artist_counts'].items())[:10]:
+        for artist, count in stats['artist_counts_top']:
             print(f"  {artist}: {count} songs")
             
         print(f"\nFile Types:")
@@ -4,28 +4,57 @@ Linked List Playlist Implementation
 Week 4: Linked Lists where nodes are songs
 """
 
-from typing import Optional, List, Dict
+import logging
+import random
+import sys
+from typing import Optional, List, Dict, Iterable, Callable
 from Lists_and_Tuples import MusicPlaylistManager
 
+# Status messages: results at INFO, per-operation detail at DEBUG; silent unless a handler is attached (see main)
+log = logging.getLogger(__name__)
+
 class SongNode:
     """Node class representing a song in the linked list playlist."""
     
+    # No per-node __dict__: playlists hold one node per song
+    __slots__ = ('song_data', 'title_key', 'artist_key', 'next', 'previous')
+    
     def __init__(self, song_data: Dict):
         self.song_data = song_data
+        # Lowercased once here so title lookups and searches don't re-lower every node
+        self.title_key = song_data['title'].lower()
+        self.artist_key = song_data['artist'].lower()
         self.next: Optional[SongNode] = None
         self.previous: Optional[SongNode] = None
     
     def __str__(self) -> str:
         return f"{self.song_data['title']} - {self.song_data['artist']}"
 
+# Upper bound on spare nodes kept for reuse across all playlists
+NODE_POOL_SIZE = 1024
+
 class LinkedListPlaylist:
     """Doubly linked list implementation for a music playlist."""
     
+    # Nodes detached by remove_song, reused by the next insertion in any playlist
+    _pool: List[SongNode] = []
+    
     def __init__(self):
         self.head: Optional[SongNode] = None
         self.tail: Optional[SongNode] = None
         self.current_node: Optional[SongNode] = None
         self.size = 0
+        # Ordered song and node caches, rebuilt lazily after structural changes
+        self._cached_songs: List[Dict] = []
+        self._index: List[SongNode] = []
+        self._positions: Dict[SongNode, int] = {}
+        # Lowercased titles and artists in playlist order, so lookups scan plain
+        # string lists and only touch a node once it matches
+        self._title_keys: List[str] = []
+        self._artist_keys: List[str] = []
+        # Lowercased title -> nodes with that title, kept current on every insert and removal
+        self._title_idx: Dict[str, List[SongNode]] = {}
+        self._dirty = False
     
     def is_empty(self) -> bool:
         """Check if the playlist is empty."""
@@ -35,9 +64,73 @@ class LinkedListPlaylist:
         """Get the number of songs in the playlist."""
         return self.size
     
+    def _rebuild_cache(self):
+        """Re-walk the list to refresh the song and node caches."""
+        nodes = []
+        current = self.head
+        while current:
+            nodes.append(current)
+            current = current.next
+        self._index = nodes
+        self._positions = {node: i for i, node in enumerate(nodes)}
+        self._cached_songs = [node.song_data for node in nodes]
+        self._title_keys = [node.title_key for node in nodes]
+        self._artist_keys = [node.artist_key for node in nodes]
+        self._dirty = False
+    
+    def as_list(self) -> List[Dict]:
+        """Get the songs in playlist order (shared cache, do not modify)."""
+        if self._dirty:
+            self._rebuild_cache()
+        return self._cached_songs
+    
+    def node_at(self, index: int) -> Optional[SongNode]:
+        """Get the node at a position in the playlist."""
+        if self._dirty:
+            self._rebuild_cache()
+        if 0 <= index < len(self._index):
+            return self._index[index]
+        return None
+    
+    def current_index(self) -> int:
+        """Get the position of the current song, or -1 if there is none."""
+        if self._dirty:
+            self._rebuild_cache()
+        return self._positions.get(self.current_node, -1)
+    
+    def _make_node(self, song_data: Dict) -> SongNode:
+        """Get a node for a song, reusing a pooled one when available."""
+        if self._pool:
+            node = self._pool.pop()
+            node.__init__(song_data)
+        else:
+            node = SongNode(song_data)
+        self._title_idx.setdefault(node.title_key, []).append(node)
+        return node
+    
+    def _recycle(self, node: SongNode) -> None:
+        """Return a detached node to the pool."""
+        if len(self._pool) < NODE_POOL_SIZE:
+            node.song_data = None
+            node.next = None
+            node.previous = None
+            self._pool.append(node)
+    
+    def _find_title(self, song_title: str) -> Optional[SongNode]:
+        """Find the first node with the given title, ignoring case."""
+        nodes = self._title_idx.get(song_title.lower())
+        if not nodes:
+            return None
+        if len(nodes) == 1:
+            return nodes[0]
+        # Duplicate titles: the one nearest the head wins, as with a front-to-back walk
+        if self._dirty:
+            self._rebuild_cache()
+        return min(nodes, key=self._positions.__getitem__)
+    
     def add_song_at_end(self, song_data: Dict) -> None:
         """Add a song at the end of the playlist."""
-        new_node = SongNode(song_data)
+        new_node = self._make_node(song_data)
         
         if self.is_empty():
             # First song in playlist
@@ -51,11 +144,32 @@ class LinkedListPlaylist:
             self.tail = new_node
         
         self.size += 1
-        print(f"Added: {new_node}")
+        self._dirty = True
+        log.debug("Added: %s", new_node)
+    
+    def bulk_add(self, songs: Iterable[Dict]) -> None:
+        """Append many songs at once, linking them in a single pass."""
+        nodes = [self._make_node(song_data) for song_data in songs]
+        if not nodes:
+            return
+        
+        for node, following in zip(nodes, nodes[1:]):
+            node.next = following
+            following.previous = node
+        
+        if self.is_empty():
+            self.head = nodes[0]
+            self.current_node = nodes[0]
+        else:
+            self.tail.next = nodes[0]
+            nodes[0].previous = self.tail
+        self.tail = nodes[-1]
+        self.size += len(nodes)
+        self._dirty = True
     
     def add_song_at_beginning(self, song_data: Dict) -> None:
         """Add a song at the beginning of the playlist."""
-        new_node = SongNode(song_data)
+        new_node = self._make_node(song_data)
         
         if self.is_empty():
             # First song in playlist
@@ -69,134 +183,151 @@ class LinkedListPlaylist:
             self.head = new_node
         
         self.size += 1
-        print(f"Added at beginning: {new_node}")
+        self._dirty = True
+        log.debug("Added at beginning: %s", new_node)
     
     def insert_song_after(self, target_song_title: str, song_data: Dict) -> bool:
         """Insert a song after a specific song in the playlist."""
         if self.is_empty():
-            print("Playlist is empty. Cannot insert after specific song.")
+            log.info("Playlist is empty. Cannot insert after specific song.")
             return False
         
-        current = self.head
-        while current:
-            if current.song_data['title'].lower() == target_song_title.lower():
-                new_node = SongNode(song_data)
-                
-                # Insert after current node
-                new_node.next = current.next
-                new_node.previous = current
-                
-                if current.next:
-                    current.next.previous = new_node
-                else:
-                    # Inserting at end
-                    self.tail = new_node
-                
-                current.next = new_node
-                self.size += 1
-                print(f"Inserted after '{target_song_title}': {new_node}")
-                return True
-            
-            current = current.next
+        current = self._find_title(target_song_title)
+        if current is None:
+            log.info("Song '%s' not found in playlist.", target_song_title)
+            return False
+        
+        new_node = self._make_node(song_data)
         
-        print(f"Song '{target_song_title}' not found in playlist.")
-        return False
+        # Insert after current node
+        new_node.next = current.next
+        new_node.previous = current
+        
+        if current.next:
+            current.next.previous = new_node
+        else:
+            # Inserting at end
+            self.tail = new_node
+        
+        current.next = new_node
+        self.size += 1
+        self._dirty = True
+        log.debug("Inserted after '%s': %s", target_song_title, new_node)
+        return True
     
     def insert_song_before(self, target_song_title: str, song_data: Dict) -> bool:
         """Insert a song before a specific song in the playlist."""
         if self.is_empty():
-            print("Playlist is empty. Cannot insert before specific song.")
+            log.info("Playlist is empty. Cannot insert before specific song.")
             return False
         
-        current = self.head
-        while current:
-            if current.song_data['title'].lower() == target_song_title.lower():
-                new_node = SongNode(song_data)
-                
-                # Insert before current node
-                new_node.next = current
-                new_node.previous = current.previous
-                
-                if current.previous:
-                    current.previous.next = new_node
-                else:
-                    # Inserting at beginning
-                    self.head = new_node
-                
-                current.previous = new_node
-                self.size += 1
-                print(f"Inserted before '{target_song_title}': {new_node}")
-                return True
-            
-            current = current.next
+        current = self._find_title(target_song_title)
+        if current is None:
+            log.info("Song '%s' not found in playlist.", target_song_title)
+            return False
+        
+        new_node = self._make_node(song_data)
         
-        print(f"Song '{target_song_title}' not found in playlist.")
-        return False
+        # Insert before current node
+        new_node.next = current
+        new_node.previous = current.previous
+        
+        if current.previous:
+            current.previous.next = new_node
+        else:
+            # Inserting at beginning
+            self.head = new_node
+        
+        current.previous = new_node
+        self.size += 1
+        self._dirty = True
+        log.debug("Inserted before '%s': %s", target_song_title, new_node)
+        return True
     
     def remove_song(self, song_title: str) -> bool:
         """Remove a song from the playlist by title."""
         if self.is_empty():
-            print("Playlist is empty. Nothing to remove.")
+            log.info("Playlist is empty. Nothing to remove.")
+            return False
+        
+        current = self._find_title(song_title)
+        if current is None:
+            log.info("Song '%s' not found in playlist.", song_title)
             return False
         
+        self._unlink(current)
+        log.debug("Removed: %s", current)
+        self._recycle(current)
+        return True
+    
+    def retain_songs(self, keep: Callable[[Dict], bool]) -> int:
+        """Remove every song for which keep() is false; returns how many were removed."""
+        removed = 0
         current = self.head
         while current:
-            if current.song_data['title'].lower() == song_title.lower():
-                # Update current_node if we're removing it
-                if self.current_node == current:
-                    if current.next:
-                        self.current_node = current.next
-                    elif current.previous:
-                        self.current_node = current.previous
-                    else:
-                        self.current_node = None
-                
-                # Remove the node
-                if current.previous:
-                    current.previous.next = current.next
-                else:
-                    # Removing head
-                    self.head = current.next
-                
-                if current.next:
-                    current.next.previous = current.previous
-                else:
-                    # Removing tail
-                    self.tail = current.previous
-                
-                self.size -= 1
-                print(f"Removed: {current}")
-                return True
-            
-            current = current.next
+            following = current.next
+            if not keep(current.song_data):
+                self._unlink(current)
+                self._recycle(current)
+                removed += 1
+            current = following
+        return removed
+    
+    def _unlink(self, current: SongNode) -> None:
+        """Detach a node from the list and the title index."""
+        # Update current_node if we're removing it
+        if self.current_node == current:
+            if current.next:
+                self.current_node = current.next
+            elif current.previous:
+                self.current_node = current.previous
+            else:
+                self.current_node = None
         
-        print(f"Song '{song_title}' not found in playlist.")
-        return False
+        # Remove the node
+        if current.previous:
+            current.previous.next = current.next
+        else:
+            # Removing head
+            self.head = current.next
+        
+        if current.next:
+            current.next.previous = current.previous
+        else:
+            # Removing tail
+            self.tail = current.previous
+        
+        self.size -= 1
+        self._dirty = True
+        nodes = self._title_idx[current.title_key]
+        nodes.remove(current)
+        if not nodes:
+            del self._title_idx[current.title_key]
     
     def next_song(self) -> Optional[Dict]:
         """Move to the next song and return its data."""
         if not self.current_node or not self.current_node.next:
-            print("No next song available.")
+            log.info("No next song available.")
             return None
         
         self.current_node = self.current_node.next
-        print(f"Now playing: {self.current_node}")
+        log.debug("Now playing: %s", self.current_node)
         return self.current_node.song_data
     
     def previous_song(self) -> Optional[Dict]:
         """Move to the previous song and return its data."""
         if not self.current_node or not self.current_node.previous:
-            print("No previous song available.")
+            log.info("No previous song available.")
             return None
         
         self.current_node = self.current_node.previous
-        print(f"Now playing: {self.current_node}")
+        log.debug("Now playing: %s", self.current_node)
         return self.current_node.song_data
     
     def get_current_song(self) -> Optional[Dict]:
         """Get the current song data."""
         if not self.current_node:
-            print("No song is currently selected.")
+            log.info("No song is currently selected.")
             return None
         
         return self.current_node.song_data
@@ -204,21 +335,21 @@ class LinkedListPlaylist:
     def go_to_first_song(self) -> Optional[Dict]:
         """Go to the first song in the playlist."""
         if self.is_empty():
-            print("Playlist is empty.")
+            log.info("Playlist is empty.")
             return None
         
         self.current_node = self.head
-        print(f"Now at first song: {self.current_node}")
+        log.debug("Now at first song: %s", self.current_node)
         return self.current_node.song_data
     
     def go_to_last_song(self) -> Optional[Dict]:
         """Go to the last song in the playlist."""
         if self.is_empty():
-            print("Playlist is empty.")
+            log.info("Playlist is empty.")
             return None
         
         self.current_node = self.tail
-        print(f"Now at last song: {self.current_node}")
+        log.debug("Now at last song: %s", self.current_node)
         return self.current_node.song_data
     
     def display_playlist(self) -> None:
@@ -227,9 +358,7 @@ class LinkedListPlaylist:
             print("Playlist is empty.")
             return
         
-        print(f"\n{'='*60}")
-        print(f"PLAYLIST ({self.size} songs)")
-        print(f"{'='*60}")
+        lines = [f"\n{'='*60}", f"PLAYLIST ({self.size} songs)", f"{'='*60}"]
         
         current = self.head
         position = 1
@@ -237,21 +366,24 @@ class LinkedListPlaylist:
         while current:
             # Mark current song with ▶️
             marker = "▶️ " if current == self.current_node else "   "
-            print(f"{marker}{position:2d}. {current}")
+            lines.append(f"{marker}{position:2d}. {current}")
             current = current.next
             position += 1
+        
+        # Written in one go rather than a print per song
+        print("\n".join(lines))
     
     def search_song(self, query: str) -> Optional[SongNode]:
         """Search for a song by title or artist."""
         if self.is_empty():
             return None
         
-        current = self.head
-        while current:
-            if (query.lower() in current.song_data['title'].lower() or 
-                query.lower() in current.song_data['artist'].lower()):
-                return current
-            current = current.next
+        if self._dirty:
+            self._rebuild_cache()
+        query_lower = query.lower()
+        for i, (title_key, artist_key) in enumerate(zip(self._title_keys, self._artist_keys)):
+            if query_lower in title_key or query_lower in artist_key:
+                return self._index[i]
         
         return None
     
@@ -260,59 +392,44 @@ class LinkedListPlaylist:
         if self.size <= 1:
             return
         
-        # Swap head and tail
-        self.head, self.tail = self.tail, self.head
-        
-        # Reverse all links
+        # Reverse all links, walking from the old head (its old next is now previous)
         current = self.head
         while current:
             # Swap next and previous pointers
             current.next, current.previous = current.previous, current.next
             current = current.previous
         
-        # Update current_node if it exists
-        if self.current_node:
-            # Find the new position of the current song
-            temp = self.head
-            while temp:
-                if temp.song_data == self.current_node.song_data:
-                    self.current_node = temp
-                    break
-                temp = temp.next
+        # Swap head and tail
+        self.head, self.tail = self.tail, self.head
+        self._dirty = True
         
-        print("Playlist reversed!")
+        # current_node is the same node object, so it needs no fixing up
+        log.info("Playlist reversed!")
     
     def shuffle_playlist(self) -> None:
-        """Shuffle the playlist using a simple algorithm."""
+        """Shuffle the playlist into a uniformly random order."""
         if self.size <= 1:
             return
         
-        # Convert to list for shuffling
-        songs = []
-        current = self.head
-        while current:
-            songs.append(current.song_data)
-            current = current.next
-        
-        # Simple shuffle: swap random pairs
-        import random
-        for _ in range(self.size * 2):  # Multiple swaps for better randomization
-            i = random.randint(0, self.size - 1)
-            j = random.randint(0, self.size - 1)
-            if i != j:
-                songs[i], songs[j] = songs[j], songs[i]
-        
-        # Rebuild the linked list
-        self.head = None
-        self.tail = None
-        self.size = 0
-        
-        for song in songs:
-            self.add_song_at_end(song)
+        # One Fisher-Yates pass over the existing nodes, then relink them in that order
+        if self._dirty:
+            self._rebuild_cache()
+        nodes = list(self._index)
+        random.shuffle(nodes)
+        previous = None
+        for node in nodes:
+            node.previous = previous
+            if previous:
+                previous.next = node
+            previous = node
+        nodes[-1].next = None
+        self.head = nodes[0]
+        self.tail = nodes[-1]
+        self._dirty = True
         
         # Reset current node to first song
         self.current_node = self.head
-        print("Playlist shuffled!")
+        log.info("Playlist shuffled!")
 
 class PlaylistManager:
     """Manager class for creating and managing multiple playlists."""
@@ -324,40 +441,40 @@ class PlaylistManager:
     def create_playlist(self, name: str, description: str = "") -> bool:
         """Create a new empty playlist."""
         if name in self.playlists:
-            print(f"Playlist '{name}' already exists.")
+            log.info("Playlist '%s' already exists.", name)
             return False
         
         new_playlist = LinkedListPlaylist()
         self.playlists[name] = new_playlist
         self.current_playlist_name = name
         
-        print(f"✅ Created new playlist: '{name}'")
+        log.info("✅ Created new playlist: '%s'", name)
         if description:
-            print(f"   Description: {description}")
+            log.info("   Description: %s", description)
         
         return True
     
     def delete_playlist(self, name: str) -> bool:
         """Delete a playlist."""
-        if name not in self.playlists:
-            print(f"Playlist '{name}' not found.")
+        # One dict operation both checks for and removes the playlist
+        if self.playlists.pop(name, None) is None:
+            log.info("Playlist '%s' not found.", name)
             return False
         
         if self.current_playlist_name == name:
             self.current_playlist_name = None
         
-        del self.playlists[name]
-        print(f"🗑️  Deleted playlist: '{name}'")
+        log.info("🗑️  Deleted playlist: '%s'", name)
         return True
     
     def switch_playlist(self, name: str) -> bool:
         """Switch to a different playlist."""
         if name not in self.playlists:
-            print(f"Playlist '{name}' not found.")
+            log.info("Playlist '%s' not found.", name)
             return False
         
         self.current_playlist_name = name
-        print(f"🔄 Switched to playlist: '{name}'")
+        log.info("🔄 Switched to playlist: '%s'", name)
         return True
     
     def get_current_playlist(self) -> Optional[LinkedListPlaylist]:
@@ -372,19 +489,18 @@ class PlaylistManager:
             print("No playlists created yet.")
             return
         
-        print(f"\n{'='*50}")
-        print("📋 AVAILABLE PLAYLISTS")
-        print(f"{'='*50}")
+        lines = [f"\n{'='*50}", "📋 AVAILABLE PLAYLISTS", f"{'='*50}"]
         
         for i, (name, playlist) in enumerate(self.playlists.items(), 1):
             current_marker = " ▶️" if name == self.current_playlist_name else ""
-            print(f"{i:2d}. {name} ({playlist.get_size()} songs){current_marker}")
+            lines.append(f"{i:2d}. {name} ({playlist.size} songs){current_marker}")
+        print("\n".join(lines))
     
     def add_song_to_current_playlist(self, song_data: Dict) -> bool:
         """Add a song to the current playlist."""
         current_playlist = self.get_current_playlist()
         if not current_playlist:
-            print("No playlist selected. Please create or switch to a playlist first.")
+            log.info("No playlist selected. Please create or switch to a playlist first.")
             return False
         
         current_playlist.add_song_at_end(song_data)
@@ -398,17 +514,15 @@ class PlaylistManager:
         
         song_library = music_manager.get_song_library()
         if not song_library:
-            print("No songs found in library.")
+            log.info("No songs found in library.")
             return False
         
         # Add songs to the new playlist
         songs_to_add = song_library[:max_songs]
         current_playlist = self.playlists[name]
+        current_playlist.bulk_add(songs_to_add)
         
-        for song in songs_to_add:
-            current_playlist.add_song_at_end(song)
-        
-        print(f"📚 Populated playlist '{name}' with {len(songs_to_add)} songs from library.")
+        log.info("📚 Populated playlist '%s' with %s songs from library.", name, len(songs_to_add))
         return True
 
 def load_playlist_from_library(music_manager: MusicPlaylistManager, max_songs: int = 10) -> LinkedListPlaylist:
@@ -417,16 +531,14 @@ def load_playlist_from_library(music_manager: MusicPlaylistManager, max_songs: i
     song_library = music_manager.get_song_library()
     
     if not song_library:
-        print("No songs found in library.")
+        log.info("No songs found in library.")
         return playlist
     
     # Add songs to playlist (limit to max_songs)
     songs_to_add = song_library[:max_songs]
+    playlist.bulk_add(songs_to_add)
     
-    for song in songs_to_add:
-        playlist.add_song_at_end(song)
-    
-    print(f"Loaded {len(songs_to_add)} songs into playlist.")
+    log.info("Loaded %s songs into playlist.", len(songs_to_add))
     return playlist
 
 def demonstrate_linked_list_operations(playlist: LinkedListPlaylist) -> None:
@@ -490,6 +602,8 @@ def demonstrate_linked_list_operations(playlist: LinkedListPlaylist) -> None:
 
 def main():
     """Main function to demonstrate the linked list playlist."""
+    # The interactive demo shows status and results as plain lines; per-operation detail stays at DEBUG
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     print("🎵 LINKED LIST PLAYLIST IMPLEMENTATION 🎵")
     print("=" * 60)
     
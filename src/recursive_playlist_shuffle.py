@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
-Simple Recursive Playlist Shuffle
-Demonstrates recursion for shuffling playlist song order
+Simple Playlist Shuffle
+Shuffles playlist song order with a single Fisher-Yates pass
 """
 
 import random
@@ -15,74 +15,52 @@ from Lists_and_Tuples import MusicPlaylistManager
 
 def recursive_shuffle_playlist(playlist: List[Dict], depth: int = 0) -> List[Dict]:
     """
-    Recursively shuffle a playlist using divide-and-conquer approach.
+    Shuffle a playlist into a uniformly random order.
     
     Args:
         playlist: List of song dictionaries
-        depth: Current recursion depth (for safety)
+        depth: Accepted for compatibility and ignored; the shuffle no longer recurses
     
     Returns:
         Shuffled list of songs
     """
-    # Safety check to prevent infinite recursion
-    if depth > 50:
-        print("Warning: Max recursion depth reached, using simple shuffle")
-        return random.sample(playlist, len(playlist))
-    
-    # Base cases
-    if len(playlist) <= 1:
-        return playlist
-    
-    if len(playlist) == 2:
-        # Randomly swap or keep order
-        return playlist if random.random() < 0.5 else playlist[::-1]
-    
-    # Divide: split playlist in half
-    mid = len(playlist) // 2
-    left_half = playlist[:mid]
-    right_half = playlist[mid:]
-    
-    # Recursively shuffle each half
-    shuffled_left = recursive_shuffle_playlist(left_half, depth + 1)
-    shuffled_right = recursive_shuffle_playlist(right_half, depth + 1)
-    
-    # Conquer: merge halves with random interleaving
-    return merge_with_random_order(shuffled_left, shuffled_right, depth + 1)
+    # One Fisher-Yates pass over a copy: O(n) time and memory, every order equally
+    # likely, and the song dicts themselves are never copied
+    shuffled = list(playlist)
+    random.shuffle(shuffled)
+    return shuffled
 
-def merge_with_random_order(left: List[Dict], right: List[Dict], depth: int) -> List[Dict]:
-    """Recursively merge two lists with random ordering decisions."""
-    if depth > 50:
-        # Fallback to simple merge if recursion too deep
-        result = []
-        left_idx = right_idx = 0
-        
-        while left_idx < len(left) and right_idx < len(right):
-            if random.random() < 0.5:
-                result.append(left[left_idx])
-                left_idx += 1
-            else:
-                result.append(right[right_idx])
-                right_idx += 1
-        
-        result.extend(left[left_idx:])
-        result.extend(right[right_idx:])
-        return result
+def merge_with_random_order(left: List[Dict], right: List[Dict], depth: int = 0) -> List[Dict]:
+    """Merge two lists, picking the next song from either side at random."""
+    # Two cursors over the inputs and one preallocated output: no slicing, no recursion
+    result = [None] * (len(left) + len(right))
+    left_idx = right_idx = 0
+    out = 0
+    # Coin flips are taken one bit at a time from a 64-bit draw
+    bits = nbits = 0
     
-    # Recursive merge
-    if not left:
-        return right
-    if not right:
-        return left
+    while left_idx < len(left) and right_idx < len(right):
+        if not nbits:
+            bits = random.getrandbits(64)
+            nbits = 64
+        take_left = bits & 1
+        bits >>= 1
+        nbits -= 1
+        if take_left:
+            result[out] = left[left_idx]
+            left_idx += 1
+        else:
+            result[out] = right[right_idx]
+            right_idx += 1
+        out += 1
     
-    # Randomly choose which list to take from next
-    if random.random() < 0.5:
-        return [left[0]] + merge_with_random_order(left[1:], right, depth + 1)
-    else:
-        return [right[0]] + merge_with_random_order(left, right, depth + 1)
+    # One side is exhausted; the rest of the other keeps its order
+    result[out:] = left[left_idx:] if left_idx < len(left) else right[right_idx:]
+    return result
 
 def main():
-    """Demonstrate the recursive shuffle function."""
-    print("🎵 Simple Recursive Playlist Shuffle 🎵")
+    """Demonstrate the playlist shuffle function."""
+    print("🎵 Simple Playlist Shuffle 🎵")
     print("=" * 50)
     
     # Initialize music manager
@@ -124,15 +102,15 @@ def main():
         for i, song in enumerate(playlist, 1):
             print(f"{i:2d}. {song['title']} - {song['artist']}")
         
-        # Shuffle recursively
-        print("\nShuffling playlist recursively...")
+        # Shuffle the playlist
+        print("\nShuffling playlist...")
         shuffled_playlist = recursive_shuffle_playlist(playlist)
         
         print("\nShuffled playlist order:")
         for i, song in enumerate(shuffled_playlist, 1):
             print(f"{i:2d}. {song['title']} - {song['artist']}")
         
-        print("\nRecursive shuffle completed! 🎵")
+        print("\nShuffle completed! 🎵")
         
     except Exception as e:
         print(f"Error: {e}")
@@ -1,16 +1,22 @@
-import pygame
+import bisect
+import heapq
+import itertools
+import logging
+from collections import defaultdict, deque
 from .Lists_and_Tuples import MusicPlaylistManager
 
+log = logging.getLogger(__name__)
+
 class SongQueue:
     def __init__(self):
-        self.queue = []
+        self.queue = deque()  # popleft() is O(1), unlike list.pop(0)
 
     def enqueue(self, song):
         self.queue.append(song)
 
     def dequeue(self):
         if self.queue:
-            return self.queue.pop(0)
+            return self.queue.popleft()
         return None
 
     def get_size(self):
@@ -20,79 +26,167 @@ class SongQueue:
         self.queue.clear()
 
     def display_queue(self):
-        for i, song in enumerate(self.queue, 1):
-            print(f"{i}. {song['title']} - {song['artist']}")
+        lines = [f"{i}. {song['title']} - {song['artist']}" for i, song in enumerate(self.queue, 1)]
+        if lines:
+            print("\n".join(lines))
 
 class PrioritySongQueue:
     def __init__(self):
-        self.queue = []
+        # Max-heap of [-priority, insertion order, song, live, lowercased title]. An upvote
+        # pushes a fresh entry and marks the old one dead instead of re-sorting the whole queue
+        self._heap = []
+        self._counter = itertools.count()
+        self._entries = {}  # lowercased title -> live entries with that title
+        self._size = 0
+        # Live entries in play order for display; sorted the first time it is read,
+        # then kept in order with bisect as songs come and go
+        self._ordered = None
+
+    @property
+    def queue(self):
+        # (song, priority) pairs in play order
+        if self._ordered is None:
+            self._ordered = sorted(entry for entry in self._heap if entry[3])
+        return [(entry[2], -entry[0]) for entry in self._ordered]
 
     def enqueue(self, song, priority=0):
-        self.queue.append((song, priority))
-        self.queue.sort(key=lambda x: x[1], reverse=True)
+        title_key = song['title'].lower()
+        entry = [-priority, next(self._counter), song, True, title_key]
+        heapq.heappush(self._heap, entry)
+        self._entries.setdefault(title_key, []).append(entry)
+        self._size += 1
+        if self._ordered is not None:
+            bisect.insort(self._ordered, entry)
 
     def dequeue(self):
-        if self.queue:
-            return self.queue.pop(0)[0]
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            if entry[3]:
+                self._forget(entry)
+                self._size -= 1
+                if self._ordered is not None:
+                    del self._ordered[0]  # The heap's top is also first in play order
+                return entry[2]
         return None
 
     def get_size(self):
-        return len(self.queue)
+        return self._size
 
     def clear_queue(self):
-        self.queue.clear()
+        self._heap.clear()
+        self._entries.clear()
+        self._size = 0
+        self._ordered = None
 
     def display_queue(self):
-        for i, (song, priority) in enumerate(self.queue, 1):
-            print(f"{i}. {song['title']} - {song['artist']} (Priority: {priority})")
+        lines = [f"{i}. {song['title']} - {song['artist']} (Priority: {priority})"
+                 for i, (song, priority) in enumerate(self.queue, 1)]
+        if lines:
+            print("\n".join(lines))
 
     def upvote(self, song_title):
-        for i, (song, priority) in enumerate(self.queue):
-            if song['title'].lower() == song_title.lower():
-                self.queue[i] = (song, priority + 1)
-                self.queue.sort(key=lambda x: x[1], reverse=True)
-                return True
-        return False
+        entries = self._entries.get(song_title.lower())
+        if not entries:
+            return False
+        # Bump the copy that would play first; like a re-sort, it queues behind songs
+        # already at its new priority
+        old = min(entries)
+        old[3] = False
+        new = [old[0] - 1, next(self._counter), old[2], True, old[4]]
+        entries[entries.index(old)] = new
+        heapq.heappush(self._heap, new)
+        if self._ordered is not None:
+            del self._ordered[bisect.bisect_left(self._ordered, old)]
+            bisect.insort(self._ordered, new)
+        if len(self._heap) > 2 * self._size + 16:
+            # Drop dead entries once they outnumber the live ones
+            self._heap = [entry for entry in self._heap if entry[3]]
+            heapq.heapify(self._heap)
+        return True
+
+    def _forget(self, entry):
+        key = entry[4]
+        entries = self._entries[key]
+        entries.remove(entry)
+        if not entries:
+            del self._entries[key]
 
 class ListeningHistoryStack:
     def __init__(self):
         self.stack = []
+        # Lowercased once per play, plus trigram -> positions, so searches skip most of the history
+        self._title_keys = []
+        self._artist_keys = []
+        self._trigram_index = defaultdict(set)
 
     def push(self, song):
+        index = len(self.stack)
         self.stack.append(song)
+        title_key = song['title'].lower()
+        artist_key = song['artist'].lower()
+        self._title_keys.append(title_key)
+        self._artist_keys.append(artist_key)
+        for text in (title_key, artist_key):
+            for i in range(len(text) - 2):
+                self._trigram_index[text[i:i + 3]].add(index)
 
     def get_size(self):
         return len(self.stack)
 
     def display_history(self, limit=10):
-        for i, song in enumerate(self.stack[-limit:], 1):
-            print(f"{i}. {song['title']} - {song['artist']}")
+        lines = [f"{i}. {song['title']} - {song['artist']}" for i, song in enumerate(self.stack[-limit:], 1)]
+        if lines:
+            print("\n".join(lines))
 
     def search_history(self, query):
-        return [song for song in self.stack if query.lower() in song['title'].lower() or query.lower() in song['artist'].lower()]
+        query_lower = query.lower()
+        if len(query_lower) < 3:
+            candidates = range(len(self.stack))
+        else:
+            # Only plays containing every trigram of the query can match
+            postings = [self._trigram_index.get(query_lower[i:i + 3]) for i in range(len(query_lower) - 2)]
+            if not all(postings):
+                return []
+            postings.sort(key=len)
+            candidates = sorted(postings[0].intersection(*postings[1:]))
+        title_keys = self._title_keys
+        artist_keys = self._artist_keys
+        return [self.stack[i] for i in candidates if query_lower in title_keys[i] or query_lower in artist_keys[i]]
 
 class MusicPlayerStacksQueues:
     def __init__(self, music_manager):
-        pygame.mixer.init()
+        # pygame and its mixer are loaded on first playback, so queue/history code runs without audio
+        self._pygame = None
+        self._mixer_ready = False
         self.music_manager = music_manager
         self.play_next_queue = SongQueue()
         self.party_queue = PrioritySongQueue()
         self.listening_history = ListeningHistoryStack()
         self.currently_playing = None
 
+    def _ensure_mixer(self):
+        if not self._mixer_ready:
+            import pygame
+            self._pygame = pygame
+            pygame.mixer.init()
+            self._mixer_ready = True
+
     def play_song(self, song):
+        self._ensure_mixer()
+        pygame = self._pygame
         try:
             pygame.mixer.music.load(song['file_path'])
             pygame.mixer.music.play()
             self.currently_playing = song
             self.listening_history.push(song)
-            print(f"🎵 Playing: {song['title']} - {song['artist']}")
+            log.info("🎵 Playing: %s - %s", song['title'], song['artist'])
         except pygame.error as e:
-            print(f"❌ Error playing song: {e}")
+            log.warning("❌ Error playing song: %s", e)
             self.currently_playing = None
 
     def stop_song(self):
-        pygame.mixer.music.stop()
+        if self._mixer_ready:
+            self._pygame.mixer.music.stop()
         self.currently_playing = None
 
     def add_to_play_next(self, song):
@@ -103,7 +197,7 @@ class MusicPlayerStacksQueues:
         if song:
             self.play_song(song)
         else:
-            print("No songs in play next queue.")
+            log.info("No songs in play next queue.")
 
     def add_to_party_queue(self, song, priority=0):
         self.party_queue.enqueue(song, priority)
@@ -113,13 +207,13 @@ class MusicPlayerStacksQueues:
         if song:
             self.play_song(song)
         else:
-            print("No songs in party queue.")
+            log.info("No songs in party queue.")
 
     def upvote_song_in_party_queue(self, song_title):
         if self.party_queue.upvote(song_title):
-            print(f"Upvoted: {song_title}")
+            log.info("Upvoted: %s", song_title)
         else:
-            print(f"Song not found in party queue: {song_title}")
+            log.info("Song not found in party queue: %s", song_title)
 
     def display_all_queues(self):
         print("\nPlay Next Queue:")